@@ -0,0 +1,45 @@
+"""Add full-text search vector to medical codes
+
+Revision ID: 3c1d9a7e5b24
+Revises: f8b2b6c4661b
+Create Date: 2026-10-16 07:05:12.418220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1d9a7e5b24'
+down_revision: Union[str, None] = 'f8b2b6c4661b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # tsvector and GIN only exist on PostgreSQL; elsewhere (SQLite dev
+    # databases) add a plain placeholder column so the mapped model still works
+    if op.get_bind().dialect.name != 'postgresql':
+        op.add_column('medical_codes', sa.Column('search_vector', sa.Text(), nullable=True))
+        return
+    op.add_column('medical_codes', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "to_tsvector('german', coalesce(name, '') || ' ' || "
+            "coalesce(description, '') || ' ' || coalesce(search_terms, ''))",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_medical_codes_search_vector', 'medical_codes', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_medical_codes_search_vector', table_name='medical_codes', postgresql_using='gin')
+    with op.batch_alter_table('medical_codes') as batch_op:
+        batch_op.drop_column('search_vector')
@@ -0,0 +1,45 @@
+"""Convert JSON columns to JSONB
+
+Revision ID: 7a4e2c9b1d63
+Revises: 3c1d9a7e5b24
+Create Date: 2026-10-16 07:40:27.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a4e2c9b1d63'
+down_revision: Union[str, None] = '3c1d9a7e5b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = [
+    ('transcriptions', 'segments'),
+    ('transcriptions', 'medical_terms'),
+    ('treatments', 'tooth_numbers'),
+    ('treatments', 'images'),
+]
+
+
+def upgrade() -> None:
+    # JSONB only exists on PostgreSQL; SQLite keeps storing JSON as text
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, column in JSON_COLUMNS:
+        op.alter_column(table, column, type_=postgresql.JSONB(), existing_type=sa.JSON(),
+                        existing_nullable=True, postgresql_using=f'{column}::jsonb')
+    op.create_index('ix_treatments_tooth_numbers_gin', 'treatments', ['tooth_numbers'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_treatments_tooth_numbers_gin', table_name='treatments', postgresql_using='gin')
+    for table, column in JSON_COLUMNS:
+        op.alter_column(table, column, type_=sa.JSON(), existing_type=postgresql.JSONB(),
+                        existing_nullable=True, postgresql_using=f'{column}::json')
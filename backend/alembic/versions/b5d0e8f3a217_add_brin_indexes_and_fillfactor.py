@@ -0,0 +1,48 @@
+"""Add BRIN indexes and fillfactor on time-ordered tables
+
+Revision ID: b5d0e8f3a217
+Revises: 848f2c1bc901
+Create Date: 2026-10-16 08:12:44.301876
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d0e8f3a217'
+down_revision: Union[str, None] = '848f2c1bc901'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BRIN_INDEXES = [
+    ('ix_recordings_created_at_brin', 'recordings', 'created_at'),
+    ('ix_treatments_treatment_date_brin', 'treatments', 'treatment_date'),
+    ('ix_transcriptions_created_at_brin', 'transcriptions', 'created_at'),
+]
+
+# Leave room on each page so status / error_message updates stay HOT
+FILLFACTOR_TABLES = ['recordings', 'treatments']
+
+
+def upgrade() -> None:
+    # BRIN and storage parameters are PostgreSQL only; SQLite gets plain indexes
+    if op.get_bind().dialect.name != 'postgresql':
+        for name, table, column in BRIN_INDEXES:
+            op.create_index(name, table, [column], unique=False)
+        return
+    for name, table, column in BRIN_INDEXES:
+        op.create_index(name, table, [column], unique=False, postgresql_using='brin',
+                        postgresql_with={'pages_per_range': 32})
+    for table in FILLFACTOR_TABLES:
+        op.execute(f'ALTER TABLE {table} SET (fillfactor = 70)')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        for table in FILLFACTOR_TABLES:
+            op.execute(f'ALTER TABLE {table} RESET (fillfactor)')
+    for name, table, _ in BRIN_INDEXES:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,67 @@
+"""Use server-side timestamptz defaults
+
+Revision ID: c9f4a1d2e6b8
+Revises: e5631632f9d8
+Create Date: 2026-10-16 08:41:09.552614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9f4a1d2e6b8'
+down_revision: Union[str, None] = 'e5631632f9d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMESTAMPED_TABLES = [
+    'medical_codes',
+    'patients',
+    'users',
+    'recordings',
+    'transcriptions',
+    'treatments',
+    'transcription_segments',
+]
+
+
+def datetime_columns():
+    """Yield (table, columns) with each column's new server default"""
+    for table in TIMESTAMPED_TABLES:
+        columns = [('created_at', sa.func.now()), ('updated_at', sa.func.now())]
+        if table == 'treatments':
+            columns += [('treatment_date', sa.func.now()), ('next_appointment', None)]
+        yield table, columns
+
+
+def upgrade() -> None:
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    for table, columns in datetime_columns():
+        # SQLite cannot ALTER a column default in place; batch mode rebuilds the table
+        with op.batch_alter_table(table) as batch_op:
+            for column, default in columns:
+                batch_op.alter_column(
+                    column,
+                    type_=sa.DateTime(timezone=True),
+                    existing_type=sa.DateTime(),
+                    server_default=default,
+                    # Existing naive values were written as UTC by datetime.utcnow
+                    postgresql_using=f"{column} AT TIME ZONE 'UTC'" if postgresql else None,
+                )
+
+
+def downgrade() -> None:
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    for table, columns in datetime_columns():
+        with op.batch_alter_table(table) as batch_op:
+            for column, _ in columns:
+                batch_op.alter_column(
+                    column,
+                    type_=sa.DateTime(),
+                    existing_type=sa.DateTime(timezone=True),
+                    server_default=None,
+                    postgresql_using=f"{column} AT TIME ZONE 'UTC'" if postgresql else None,
+                )
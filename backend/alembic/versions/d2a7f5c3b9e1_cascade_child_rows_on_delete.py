@@ -0,0 +1,50 @@
+"""Cascade child rows on delete in the database
+
+Revision ID: d2a7f5c3b9e1
+Revises: c9f4a1d2e6b8
+Create Date: 2026-10-16 07:05:12.418337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7f5c3b9e1'
+down_revision: Union[str, None] = 'c9f4a1d2e6b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The initial schema left foreign keys unnamed; this matches PostgreSQL's
+# generated names and lets batch mode find them on SQLite
+NAMING_CONVENTION = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+# (table, column, referenced table, ON DELETE action)
+FOREIGN_KEYS = [
+    ('recordings', 'patient_id', 'patients', 'CASCADE'),
+    ('transcriptions', 'recording_id', 'recordings', 'CASCADE'),
+    ('transcription_segments', 'transcription_id', 'transcriptions', 'CASCADE'),
+    ('treatments', 'patient_id', 'patients', 'CASCADE'),
+    ('treatments', 'transcription_id', 'transcriptions', 'SET NULL'),
+    ('treatment_medical_codes', 'treatment_id', 'treatments', 'CASCADE'),
+    ('treatment_medical_codes', 'medical_code_id', 'medical_codes', 'CASCADE'),
+]
+
+
+def replace_foreign_keys(with_ondelete: bool) -> None:
+    for table, column, referent, ondelete in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(name, type_='foreignkey')
+            batch_op.create_foreign_key(
+                name, referent, [column], ['id'], ondelete=ondelete if with_ondelete else None
+            )
+
+
+def upgrade() -> None:
+    replace_foreign_keys(with_ondelete=True)
+
+
+def downgrade() -> None:
+    replace_foreign_keys(with_ondelete=False)
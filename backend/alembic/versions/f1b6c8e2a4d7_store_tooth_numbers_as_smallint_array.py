@@ -0,0 +1,62 @@
+"""Store treatment tooth numbers as a smallint array
+
+Revision ID: f1b6c8e2a4d7
+Revises: d2a7f5c3b9e1
+Create Date: 2026-10-16 07:21:40.862015
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b6c8e2a4d7'
+down_revision: Union[str, None] = 'd2a7f5c3b9e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def replace_tooth_numbers(column_type, conversion: str) -> None:
+    """Swap tooth_numbers for a column of column_type filled by the conversion SQL.
+
+    ALTER COLUMN ... USING cannot contain a subquery, so the values are copied
+    through a temporary column instead.
+    """
+    op.add_column('treatments', sa.Column('tooth_numbers_new', column_type, nullable=True))
+    op.execute(f'UPDATE treatments SET tooth_numbers_new = {conversion} WHERE tooth_numbers IS NOT NULL')
+    op.drop_index('ix_treatments_tooth_numbers_gin', table_name='treatments', postgresql_using='gin')
+    op.drop_column('treatments', 'tooth_numbers')
+    op.alter_column('treatments', 'tooth_numbers_new', new_column_name='tooth_numbers')
+    op.create_index('ix_treatments_tooth_numbers_gin', 'treatments', ['tooth_numbers'], unique=False, postgresql_using='gin')
+
+
+# FDI tooth numbers: permanent teeth in quadrants 1-4, deciduous teeth in 5-8
+FDI_TOOTH_NUMBERS = sorted(
+    [quadrant * 10 + tooth for quadrant in range(1, 5) for tooth in range(1, 9)]
+    + [quadrant * 10 + tooth for quadrant in range(5, 9) for tooth in range(1, 6)]
+)
+
+
+def upgrade() -> None:
+    # SQLite keeps tooth numbers in the JSON column
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    replace_tooth_numbers(
+        postgresql.ARRAY(sa.SmallInteger()),
+        'ARRAY(SELECT jsonb_array_elements_text(tooth_numbers)::smallint)',
+    )
+    op.create_check_constraint(
+        'ck_treatments_tooth_numbers_fdi',
+        'treatments',
+        f'tooth_numbers <@ ARRAY{FDI_TOOTH_NUMBERS}::smallint[]',
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_constraint('ck_treatments_tooth_numbers_fdi', 'treatments', type_='check')
+    replace_tooth_numbers(postgresql.JSONB(astext_type=sa.Text()), 'to_jsonb(tooth_numbers)')
@@ -2,7 +2,9 @@
 Main API router for v1 endpoints
 """
 
+import orjson
 from fastapi import APIRouter
+from fastapi.responses import Response
 
 # Import endpoint routers
 from app.api.v1.endpoints import documentation
@@ -22,26 +24,30 @@ api_router.include_router(
 # api_router.include_router(patients.router, prefix="/patients", tags=["patients"])
 # api_router.include_router(evident.router, prefix="/evident", tags=["evident"])
 
+# API root payload never changes, so serialize it once at import
+API_ROOT_JSON = orjson.dumps({
+    "message": "MedVox API v1", 
+    "status": "active",
+    "version": "1.0.0",
+    "features": [
+        "Audio processing",
+        "Speech-to-text transcription", 
+        "German dental terminology",
+        "BEMA/GOZ billing code generation",
+        "Structured documentation output"
+    ],
+    "endpoints": {
+        "documentation": "/api/v1/documentation/",
+        "process_audio": "/api/v1/documentation/process-audio",
+        "process_text": "/api/v1/documentation/process-text",
+        "supported_formats": "/api/v1/documentation/supported-formats",
+        "docs": "/docs"
+    }
+})
+
+
 # API root endpoint
 @api_router.get("/")
 async def api_root():
     """API root endpoint"""
-    return {
-        "message": "MedVox API v1", 
-        "status": "active",
-        "version": "1.0.0",
-        "features": [
-            "Audio processing",
-            "Speech-to-text transcription", 
-            "German dental terminology",
-            "BEMA/GOZ billing code generation",
-            "Structured documentation output"
-        ],
-        "endpoints": {
-            "documentation": "/api/v1/documentation/",
-            "process_audio": "/api/v1/documentation/process-audio",
-            "process_text": "/api/v1/documentation/process-text",
-            "supported_formats": "/api/v1/documentation/supported-formats",
-            "docs": "/docs"
-        }
-    } 
\ No newline at end of file
+    return Response(content=API_ROOT_JSON, media_type="application/json")
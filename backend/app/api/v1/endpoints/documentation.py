@@ -3,18 +3,23 @@ Documentation API Endpoints
 Handles audio upload and processing for dental documentation
 """
 
-import io
+import hashlib
+import tempfile
 import time
+import orjson
 from typing import Optional
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Request
+from fastapi.responses import JSONResponse, Response
 import structlog
 
+from app.core.config import settings
 from app.services.audio_service import AudioService, AudioTranscriptionError
 from app.services.documentation_processor import DocumentationProcessor
 from app.schemas.dental_documentation import (
-    DocumentationResponse, DocumentationCreateRequest, DentalDocumentation
+    DocumentationResponse, DocumentationCreateRequest, DentalDocumentation,
+    TranscriptionResult, AudioMetadata
 )
+from app.utils.audio import AudioProcessor, create_test_audio_file, map_upload
 
 logger = structlog.get_logger()
 
@@ -23,15 +28,78 @@ router = APIRouter()
 # Initialize services
 audio_service = AudioService()
 doc_processor = DocumentationProcessor()
+audio_processor = AudioProcessor()
 
+# Format and size limits are fixed per process, so serialize them once
+SUPPORTED_FORMATS_JSON = orjson.dumps({
+    "supported_formats": audio_service.get_supported_formats(),
+    "max_file_size_mb": audio_service.get_max_file_size() // (1024 * 1024),
+    "max_file_size_bytes": audio_service.get_max_file_size(),
+    "recommended_sample_rate": 16000,
+    "recommended_format": "wav"
+})
 
-@router.post("/process-audio", response_model=DocumentationResponse)
+# The test tone is deterministic, so synthesize it once instead of per request
+TEST_AUDIO_WAV = create_test_audio_file()
+TEST_AUDIO_HEADERS = {
+    "Content-Disposition": "attachment; filename=test_audio.wav",
+    "Cache-Control": "public, max-age=3600",
+    "ETag": f'"{hashlib.blake2b(TEST_AUDIO_WAV, digest_size=8).hexdigest()}"',
+}
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak If-None-Match comparison: "*", or any listed tag equal to etag ignoring W/"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _json_response(response: DocumentationResponse) -> Response:
+    """Serialize an already validated response straight to JSON bytes (pydantic-core writer)"""
+    return Response(content=response.model_dump_json(), media_type="application/json")
+
+
+async def _spool_upload(audio_file: UploadFile, max_size: int) -> tempfile.SpooledTemporaryFile:
+    """
+    Stream an upload into a spooled temporary file in fixed-size chunks.
+    
+    Small uploads stay in memory, larger ones spill to disk, and oversized
+    uploads are rejected with 413 as soon as the limit is crossed instead of
+    after the whole body has been buffered.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.UPLOAD_SPOOL_MAX_SIZE)
+    total_size = 0
+    
+    try:
+        while chunk := await audio_file.read(settings.UPLOAD_CHUNK_SIZE):
+            total_size += len(chunk)
+            if total_size > max_size:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large (max: {max_size} bytes)"
+                )
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    
+    spool.seek(0)
+    return spool
+
+
+@router.post("/process-audio", responses={200: {"model": DocumentationResponse}})
 async def process_audio_documentation(
     audio_file: UploadFile = File(..., description="Audio file (WAV, MP3, M4A)"),
     patient_id: Optional[str] = Form(None, description="Patient ID from Evident"),
     dentist_id: str = Form(..., description="Dentist identifier"),
     treatment_context: Optional[str] = Form(None, description="Treatment context/notes"),
-    use_mock: bool = Form(False, description="Use mock transcription for testing")
+    use_mock: bool = Form(False, description="Use mock transcription for testing"),
+    include_segments: bool = Form(False, description="Include timed transcription segments")
 ):
     """
     Process audio file and generate structured dental documentation
@@ -44,94 +112,85 @@ async def process_audio_documentation(
     5. Returns structured JSON output
     """
     
-    logger.info("Processing audio documentation request",
-               filename=audio_file.filename,
-               patient_id=patient_id,
-               dentist_id=dentist_id,
-               use_mock=use_mock)
+    structlog.contextvars.bind_contextvars(
+        filename=audio_file.filename,
+        patient_id=patient_id,
+        dentist_id=dentist_id
+    )
+    logger.info("Processing audio documentation request", use_mock=use_mock)
     
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
+    audio_file_obj = None
     
     try:
         # Validate file
         if not audio_file.filename:
             raise HTTPException(status_code=400, detail="No filename provided")
         
-        # Check file size
-        max_size = audio_service.get_max_file_size()
-        content = await audio_file.read()
-        
-        if len(content) > max_size:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File too large: {len(content)} bytes (max: {max_size})"
-            )
-        
-        # Create file-like object
-        audio_file_obj = io.BytesIO(content)
+        # Stream upload to a bounded spool, aborting early if it is too large
+        audio_file_obj = await _spool_upload(audio_file, audio_service.get_max_file_size())
         
         # Process audio (transcription)
-        logger.info("Starting audio transcription", filename=audio_file.filename)
         transcription_result, audio_metadata = await audio_service.process_audio(
             audio_file_obj, 
             audio_file.filename,
-            use_mock=use_mock
+            use_mock=use_mock,
+            need_segments=include_segments
         )
         
         # Process transcription (extract dental information)
-        logger.info("Starting documentation processing")
         documentation = await doc_processor.process_transcription(
             transcription_result=transcription_result,
             audio_metadata=audio_metadata
         )
         
-        processing_time = int((time.time() - start_time) * 1000)
+        processing_time = (time.perf_counter_ns() - start_time) // 1_000_000
         
         logger.info("Audio documentation processing completed",
-                   filename=audio_file.filename,
                    recording_id=documentation.recording_id,
                    findings_count=len(documentation.findings),
                    billing_codes_count=len(documentation.billing_codes),
                    total_processing_time_ms=processing_time)
         
-        return DocumentationResponse(
+        return _json_response(DocumentationResponse(
             success=True,
             documentation=documentation,
             processing_time_ms=processing_time
-        )
+        ))
         
     except AudioTranscriptionError as e:
-        logger.error("Audio transcription failed", 
-                    filename=audio_file.filename,
-                    error=str(e))
+        logger.error("Audio transcription failed", error=str(e))
         
-        processing_time = int((time.time() - start_time) * 1000)
+        processing_time = (time.perf_counter_ns() - start_time) // 1_000_000
         
-        return DocumentationResponse(
+        return _json_response(DocumentationResponse(
             success=False,
             error_message=f"Transcription failed: {str(e)}",
             processing_time_ms=processing_time
-        )
+        ))
         
     except HTTPException:
         raise  # Re-raise HTTP exceptions
         
     except Exception as e:
         logger.error("Documentation processing failed",
-                    filename=audio_file.filename,
                     error=str(e),
                     exc_info=True)
         
-        processing_time = int((time.time() - start_time) * 1000)
+        processing_time = (time.perf_counter_ns() - start_time) // 1_000_000
         
-        return DocumentationResponse(
+        return _json_response(DocumentationResponse(
             success=False,
             error_message=f"Processing failed: {str(e)}",
             processing_time_ms=processing_time
-        )
+        ))
+    
+    finally:
+        if audio_file_obj is not None:
+            audio_file_obj.close()
 
 
-@router.post("/process-text", response_model=DocumentationResponse)
+@router.post("/process-text", responses={200: {"model": DocumentationResponse}})
 async def process_text_documentation(
     text: str = Form(..., description="Transcribed text to process"),
     patient_id: Optional[str] = Form(None, description="Patient ID from Evident"),
@@ -144,17 +203,13 @@ async def process_text_documentation(
     Useful for testing or when you already have transcribed text
     """
     
-    logger.info("Processing text documentation request",
-               text_length=len(text),
-               patient_id=patient_id,
-               dentist_id=dentist_id)
+    structlog.contextvars.bind_contextvars(patient_id=patient_id, dentist_id=dentist_id)
+    logger.info("Processing text documentation request", text_length=len(text))
     
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     
     try:
         # Create mock transcription result
-        from app.schemas.dental_documentation import TranscriptionResult, AudioMetadata
-        
         transcription_result = TranscriptionResult(
             text=text,
             language="de",
@@ -177,7 +232,7 @@ async def process_text_documentation(
             audio_metadata=audio_metadata
         )
         
-        processing_time = int((time.time() - start_time) * 1000)
+        processing_time = (time.perf_counter_ns() - start_time) // 1_000_000
         
         logger.info("Text documentation processing completed",
                    recording_id=documentation.recording_id,
@@ -185,61 +240,43 @@ async def process_text_documentation(
                    billing_codes_count=len(documentation.billing_codes),
                    processing_time_ms=processing_time)
         
-        return DocumentationResponse(
+        return _json_response(DocumentationResponse(
             success=True,
             documentation=documentation,
             processing_time_ms=processing_time
-        )
+        ))
         
     except Exception as e:
         logger.error("Text processing failed", error=str(e), exc_info=True)
         
-        processing_time = int((time.time() - start_time) * 1000)
+        processing_time = (time.perf_counter_ns() - start_time) // 1_000_000
         
-        return DocumentationResponse(
+        return _json_response(DocumentationResponse(
             success=False,
             error_message=f"Text processing failed: {str(e)}",
             processing_time_ms=processing_time
-        )
+        ))
 
 
 @router.get("/supported-formats")
 async def get_supported_formats():
     """Get list of supported audio formats and limits"""
     
-    return {
-        "supported_formats": audio_service.get_supported_formats(),
-        "max_file_size_mb": audio_service.get_max_file_size() // (1024 * 1024),
-        "max_file_size_bytes": audio_service.get_max_file_size(),
-        "recommended_sample_rate": 16000,
-        "recommended_format": "wav"
-    }
+    return Response(content=SUPPORTED_FORMATS_JSON, media_type="application/json")
 
 
 @router.get("/test-audio")
-async def get_test_audio():
-    """Generate a test audio file for testing"""
+async def get_test_audio(request: Request):
+    """Serve the test audio file for testing"""
     
-    try:
-        from app.utils.audio import create_test_audio_file
-        
-        # Create test audio
-        test_audio = create_test_audio_file()
-        
-        logger.info("Generated test audio file", size_bytes=len(test_audio))
-        
-        # Return as response
-        from fastapi import Response
-        
-        return Response(
-            content=test_audio,
-            media_type="audio/wav",
-            headers={"Content-Disposition": "attachment; filename=test_audio.wav"}
-        )
-        
-    except Exception as e:
-        logger.error("Failed to generate test audio", error=str(e))
-        raise HTTPException(status_code=500, detail=f"Failed to generate test audio: {str(e)}")
+    if _etag_matches(request.headers.get("if-none-match"), TEST_AUDIO_HEADERS["ETag"]):
+        return Response(status_code=304, headers=TEST_AUDIO_HEADERS)
+    
+    return Response(
+        content=TEST_AUDIO_WAV,
+        media_type="audio/wav",
+        headers=TEST_AUDIO_HEADERS
+    )
 
 
 @router.post("/validate-audio")
@@ -248,20 +285,17 @@ async def validate_audio_file(
 ):
     """Validate an audio file without processing it"""
     
-    logger.info("Validating audio file", filename=audio_file.filename)
+    structlog.contextvars.bind_contextvars(filename=audio_file.filename)
+    logger.info("Validating audio file")
     
     try:
-        # Read file content
-        content = await audio_file.read()
-        
-        # Validate using audio processor
-        from app.utils.audio import AudioProcessor
-        processor = AudioProcessor()
-        
-        metadata = processor.validate_audio(content, audio_file.filename)
+        # Stream file content to a bounded spool
+        with await _spool_upload(audio_file, audio_service.get_max_file_size()) as spool:
+            # Validate using audio processor
+            with map_upload(spool) as content:
+                metadata = audio_processor.validate_audio(content, audio_file.filename)
         
         logger.info("Audio validation successful",
-                   filename=audio_file.filename,
                    duration=metadata.duration_seconds,
                    sample_rate=metadata.sample_rate)
         
@@ -277,17 +311,14 @@ async def validate_audio_file(
             }
         }
         
+    except HTTPException:
+        raise  # Re-raise HTTP exceptions
+        
     except Exception as e:
-        logger.error("Audio validation failed",
-                    filename=audio_file.filename,
-                    error=str(e))
+        logger.error("Audio validation failed", error=str(e))
         
         return {
             "valid": False,
             "filename": audio_file.filename,
             "error": str(e)
-        }
-
-
-# Add missing import
-import time 
\ No newline at end of file
+        } 
\ No newline at end of file
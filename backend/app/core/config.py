@@ -2,8 +2,9 @@
 Configuration settings for MedVox
 """
 import os
-from typing import List, Optional
-from pydantic_settings import BaseSettings
+from functools import cached_property, lru_cache
+from typing import Optional, Tuple
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 from dotenv import load_dotenv
 
@@ -14,12 +15,22 @@ load_dotenv("../.env")
 class Settings(BaseSettings):
     """Application settings loaded directly from environment variables"""
     
+    model_config = SettingsConfigDict(
+        case_sensitive=True,
+        extra="ignore",  # Ignore extra environment variables
+    )
+    
     # App Settings
     PROJECT_NAME: str = "MedVox"
     DEBUG: bool = True
     LOG_LEVEL: str = "INFO"
+    QUIET_PATH_LOG_SAMPLE_RATE: float = 0.01  # Fraction of health/readiness probe requests that are logged
+    SLOW_REQUEST_SECONDS: float = 1.0  # Requests slower than this are always logged
+    API_WORKERS: int = 1  # uvicorn worker processes outside development (each loads its own Whisper model)
     UPLOAD_DIR: str = "./uploads"
     MAX_FILE_SIZE: int = 50 * 1024 * 1024  # 50MB
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # 1MB read size when streaming uploads
+    UPLOAD_SPOOL_MAX_SIZE: int = 8 * 1024 * 1024  # Uploads larger than 8MB spill to disk
     
     # CORS
     ALLOWED_HOSTS: str = "http://localhost:3000,http://127.0.0.1:3000,http://localhost:8080,http://127.0.0.1:8080"
@@ -33,15 +44,30 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./medvox.db"
     ECHO_SQL: bool = False
+    QUERY_REPEAT_THRESHOLD: int = 10  # Development N+1 guard: flag requests repeating one statement more often
+    QUERY_REPEAT_RAISE: bool = False  # Raise instead of logging; enables the guard outside development (set by conftest.py)
+    QUERY_REPEAT_ALLOWED_PATHS: str = ""  # Comma-separated paths exempt from the N+1 guard
     
     # OpenAI/Whisper
     OPENAI_API_KEY: Optional[str] = None
     OPENAI_MODEL: str = "whisper-1"
+    OPENAI_TIMEOUT_SECONDS: float = 60.0  # Per-attempt timeout for OpenAI API calls
     MAX_AUDIO_SIZE_MB: int = 25
     SUPPORTED_AUDIO_FORMATS: str = "wav,mp3,m4a,flac"
     AUDIO_SAMPLE_RATE: int = 44100  # Higher quality for better accuracy
     WHISPER_MODEL_SIZE: str = "large-v3"  # Best available model
     WHISPER_DEVICE: str = "auto"
+    WHISPER_BACKEND: str = "faster-whisper"  # faster-whisper (CTranslate2) or openai-whisper
+    WHISPER_COMPUTE_TYPE: str = "int8_float16"  # CTranslate2 compute type (falls back to int8 on CPU)
+    WHISPER_BEAM_SIZE: int = 1  # faster-whisper beam width (1 = greedy decoding)
+    WHISPER_VAD_FILTER: bool = True  # Cut silence with Silero VAD before openai-whisper (faster-whisper batching always uses VAD)
+    WHISPER_MODEL_DIR: Optional[str] = None  # Weight cache directory, e.g. a persistent volume (library default if unset)
+    WHISPER_LOCAL_FILES_ONLY: bool = False  # faster-whisper: fail instead of downloading weights missing from the cache
+    WHISPER_PRELOAD: bool = False  # Load and warm up the local model at startup instead of on first request (enable per deployment)
+    INFER_CONCURRENCY: int = 1  # Concurrent local Whisper inference slots (at least one per GPU)
+    BATCH_WINDOW_MS: int = 20  # How long to collect concurrent requests into one batch
+    BATCH_MAX_SIZE: int = 16  # Maximum clips per batched Whisper forward
+    BATCH_DURATION_BIN_SECONDS: float = 2.0  # Only batch clips of similar length
     
     # Enhanced transcription settings
     WHISPER_TEMPERATURE: float = 0.1  # Lower for more consistent medical terms
@@ -69,25 +95,35 @@ class Settings(BaseSettings):
     EVIDENT_API_KEY: Optional[str] = None
     EVIDENT_CLIENT_ID: Optional[str] = None
     
-    @property
+    @cached_property
     def is_development(self) -> bool:
-        """Check if running in development mode"""
+        """Check if running in development mode (resolved once)"""
         return self.DEBUG
     
-    @property
+    @cached_property
     def is_production(self) -> bool:
-        """Check if running in production mode"""
+        """Check if running in production mode (resolved once)"""
         return not self.DEBUG
     
-    @property
-    def allowed_hosts_list(self) -> List[str]:
-        """Get CORS allowed hosts as a list"""
-        return [host.strip() for host in self.ALLOWED_HOSTS.split(",")]
+    @cached_property
+    def allowed_hosts_list(self) -> Tuple[str, ...]:
+        """Get CORS allowed hosts (parsed once)"""
+        return tuple(host.strip() for host in self.ALLOWED_HOSTS.split(","))
+    
+    @cached_property
+    def query_repeat_guard_enabled(self) -> bool:
+        """Count statements per request: always in development, and wherever repeats raise (e.g. CI)"""
+        return self.is_development or self.QUERY_REPEAT_RAISE
+    
+    @cached_property
+    def query_repeat_allowed_paths(self) -> frozenset:
+        """Get paths exempt from the N+1 guard (parsed once)"""
+        return frozenset(path.strip() for path in self.QUERY_REPEAT_ALLOWED_PATHS.split(",") if path.strip())
     
-    @property
-    def supported_audio_formats_list(self) -> List[str]:
-        """Get supported audio formats as a list"""
-        return [fmt.strip() for fmt in self.SUPPORTED_AUDIO_FORMATS.split(",")]
+    @cached_property
+    def supported_audio_formats_list(self) -> Tuple[str, ...]:
+        """Get supported audio formats (parsed once)"""
+        return tuple(fmt.strip() for fmt in self.SUPPORTED_AUDIO_FORMATS.split(","))
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -103,11 +139,13 @@ class Settings(BaseSettings):
             if not self.OPENAI_API_KEY:
                 import warnings
                 warnings.warn("OPENAI_API_KEY not set - only mock transcription will work")
-    
-    class Config:
-        case_sensitive = True
-        extra = "ignore"  # Ignore extra environment variables
 
 
-# Create settings instance
-settings = Settings() 
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the settings once per process"""
+    return Settings()
+
+
+# Create settings instance; get_settings() returns this same object
+settings = get_settings() 
\ No newline at end of file
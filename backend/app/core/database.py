@@ -2,41 +2,94 @@
 Database session management and configuration
 """
 
-from typing import Generator
+from collections import Counter
+from contextvars import ContextVar
+from typing import AsyncGenerator, Optional
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import settings
 
+# Sync driver URL prefixes and their asyncio counterparts
+ASYNC_DRIVERS = {
+    "postgresql://": "postgresql+asyncpg://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its asyncio driver"""
+    for prefix, async_prefix in ASYNC_DRIVERS.items():
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+
+database_url = get_async_database_url(settings.DATABASE_URL)
+
+# SQLite uses a file/static pool that does not take sizing arguments
+pool_options = {} if database_url.startswith("sqlite") else {
+    "pool_size": 10,
+    "max_overflow": 20,
+}
+
 # Create database engine
-engine = create_engine(
-    settings.database.DATABASE_URL,
-    echo=settings.database.ECHO_SQL,
+engine = create_async_engine(
+    database_url,
+    echo=settings.ECHO_SQL,
     pool_pre_ping=True,  # Verify connections before using them
-    pool_size=10,
-    max_overflow=20,
+    **pool_options,
 )
 
+# SQLite ignores foreign keys (and so ON DELETE CASCADE) unless asked per connection
+if database_url.startswith("sqlite"):
+    @event.listens_for(engine.sync_engine, "connect")
+    def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+# Statement counts for the request being handled, set by the request middleware
+# in development and under test so N+1 query patterns surface before they
+# reach production
+request_statements: ContextVar[Optional[Counter]] = ContextVar("request_statements", default=None)
+
+
+class RepeatedQueryError(RuntimeError):
+    """A request repeated one SQL statement past QUERY_REPEAT_THRESHOLD"""
+
+
+if settings.query_repeat_guard_enabled:
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_request_statements(conn, cursor, statement, parameters, context, executemany):
+        counts = request_statements.get()
+        if counts is None:
+            return
+        counts[statement] += 1
+        if settings.QUERY_REPEAT_RAISE and counts[statement] > settings.QUERY_REPEAT_THRESHOLD:
+            raise RepeatedQueryError(
+                f"Statement executed {counts[statement]} times in one request (likely N+1): {statement}"
+            )
+
 # Create session factory
-SessionLocal = sessionmaker(
-    autocommit=False,
+SessionLocal = async_sessionmaker(
+    engine,
+    class_=AsyncSession,
     autoflush=False,
-    bind=engine,
+    expire_on_commit=False,
 )
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency to get database session.
     Use this in FastAPI endpoints:
     
     @app.get("/items/")
-    def read_items(db: Session = Depends(get_db)):
-        return db.query(Item).all()
+    async def read_items(db: AsyncSession = Depends(get_db)):
+        result = await db.execute(select(Item))
+        return result.scalars().all()
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close() 
\ No newline at end of file
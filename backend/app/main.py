@@ -3,36 +3,54 @@ MedVox FastAPI Application
 Main entry point for the MedVox backend API
 """
 
+import logging
+import random
+import uuid
+from collections import Counter
+from contextlib import asynccontextmanager
+import orjson
 import structlog
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 import time
 
 from app.core.config import settings
+from app.core.database import request_statements
 
-# Configure structlog for JSON logging
+
+# Configure structlog for JSON logging. Events are rendered straight to bytes
+# and written to stdout without going through stdlib logging (and its locks)
 structlog.configure(
     processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
+        structlog.processors.JSONRenderer(serializer=orjson.dumps)
     ],
     context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
+    logger_factory=structlog.BytesLoggerFactory(),
+    wrapper_class=structlog.make_filtering_bound_logger(
+        getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
+    ),
     cache_logger_on_first_use=True,
 )
 
 logger = structlog.get_logger()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the transcription model before serving the first request"""
+    if settings.WHISPER_PRELOAD:
+        from app.api.v1.endpoints.documentation import audio_service
+        await audio_service.warmup()
+    yield
+
+
 # Create FastAPI application
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -41,6 +59,8 @@ app = FastAPI(
     openapi_url="/api/v1/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware with restricted origins
@@ -58,52 +78,89 @@ app.add_middleware(
     allowed_hosts=["*"] if settings.is_development else ["localhost", "127.0.0.1"],
 )
 
+# Security headers, built once at startup
+SECURITY_HEADERS = {
+    "X-Frame-Options": settings.X_FRAME_OPTIONS,
+    "X-Content-Type-Options": "nosniff",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+}
+
+# HSTS header (only in production)
+if settings.is_production:
+    SECURITY_HEADERS["Strict-Transport-Security"] = f"max-age={settings.HSTS_MAX_AGE}; includeSubDomains"
+
 # Security headers middleware
 @app.middleware("http")
 async def add_security_headers(request: Request, call_next):
     """Add security headers to all responses"""
     response = await call_next(request)
-    
-    # Security headers
-    response.headers["X-Frame-Options"] = settings.X_FRAME_OPTIONS
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    
-    # HSTS header (only in production)
-    if settings.is_production:
-        response.headers["Strict-Transport-Security"] = f"max-age={settings.HSTS_MAX_AGE}; includeSubDomains"
-    
+    response.headers.update(SECURITY_HEADERS)
     return response
 
+# Probe endpoints are hit constantly; their request logs are sampled
+QUIET_PATHS = frozenset({"/health", "/ready"})
+
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log all requests with timing"""
-    start_time = time.time()
-    
-    # Log request
-    logger.info(
-        "Request started",
-        method=request.method,
-        url=str(request.url),
-        client_ip=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
-    )
+    """Log requests with timing (probe endpoints only when sampled, failing or slow)"""
+    start_time = time.perf_counter_ns()
+    quiet = request.url.path in QUIET_PATHS
     
-    response = await call_next(request)
+    # Every log line emitted while handling this request carries its ID
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    structlog.contextvars.bind_contextvars(request_id=request_id, path=request.url.path)
     
-    # Log response
-    process_time = time.time() - start_time
-    logger.info(
-        "Request completed",
-        method=request.method,
-        url=str(request.url),
-        status_code=response.status_code,
-        process_time=round(process_time, 4),
-    )
+    # Count SQL statements per request in development to catch N+1 regressions
+    statements = None
+    if settings.query_repeat_guard_enabled and request.url.path not in settings.query_repeat_allowed_paths:
+        statements = Counter()
+        request_statements.set(statements)
     
-    return response
+    try:
+        # Log request
+        if not quiet:
+            logger.info(
+                "Request started",
+                method=request.method,
+                url=str(request.url),
+                client_ip=request.client.host if request.client else None,
+                user_agent=request.headers.get("user-agent"),
+            )
+        
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        
+        # Log response
+        process_time = (time.perf_counter_ns() - start_time) / 1e9
+        if (
+            not quiet
+            or response.status_code >= 400
+            or process_time > settings.SLOW_REQUEST_SECONDS
+            or random.random() < settings.QUIET_PATH_LOG_SAMPLE_RATE
+        ):
+            logger.info(
+                "Request completed",
+                method=request.method,
+                url=str(request.url),
+                status_code=response.status_code,
+                process_time=round(process_time, 4),
+            )
+        
+        if statements:
+            statement, count = statements.most_common(1)[0]
+            if count > settings.QUERY_REPEAT_THRESHOLD:
+                logger.warning(
+                    "Repeated query in request (likely N+1)",
+                    count=count,
+                    total_queries=sum(statements.values()),
+                    statement=statement,
+                )
+        
+        return response
+    finally:
+        structlog.contextvars.clear_contextvars()
 
 # Import API router after middleware setup
 from app.api.v1.api import api_router
@@ -111,24 +168,34 @@ from app.api.v1.api import api_router
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
+try:
+    from prometheus_client import make_asgi_app
+except ImportError:  # Metrics are optional
+    make_asgi_app = None
+if make_asgi_app is not None:
+    app.mount("/metrics", make_asgi_app())
+
+
+# Static payload, serialized once at import
+ROOT_JSON = orjson.dumps({
+    "message": f"Welcome to {settings.PROJECT_NAME} API",
+    "version": "0.1.0",
+    "docs": "/docs",
+    "health": "/health",
+    "ready": "/ready",
+})
+
 
 @app.get("/")
 async def root():
     """Root endpoint"""
     logger.info("Root endpoint accessed")
-    return {
-        "message": f"Welcome to {settings.PROJECT_NAME} API",
-        "version": "0.1.0",
-        "docs": "/docs",
-        "health": "/health",
-        "ready": "/ready",
-    }
+    return Response(content=ROOT_JSON, media_type="application/json")
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    logger.info("Health check requested")
     return {
         "status": "healthy", 
         "service": "medvox-api",
@@ -140,8 +207,6 @@ async def health_check():
 @app.get("/ready")
 async def readiness_check():
     """Readiness check endpoint for Docker/K8s"""
-    logger.info("Readiness check requested")
-    
     # TODO: Add actual health checks for:
     # - Database connectivity
     # - OpenAI API connectivity
@@ -192,10 +257,16 @@ if __name__ == "__main__":
                 debug=settings.is_development,
                 allowed_hosts=settings.allowed_hosts_list)
     
+    # uvloop/httptools come with uvicorn[standard]. Reload needs a single
+    # process; in production scale with API_WORKERS when CPU-bound, or keep
+    # one worker and raise INFER_CONCURRENCY when the GPU is the limit
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=None if settings.is_development else max(1, settings.API_WORKERS),
         reload=settings.is_development,
         log_level=settings.LOG_LEVEL.lower(),
     ) 
\ No newline at end of file
@@ -7,7 +7,8 @@ from app.models.user import User, UserRole
 from app.models.patient import Patient, Gender, InsuranceType
 from app.models.recording import Recording, RecordingStatus
 from app.models.transcription import Transcription
-from app.models.treatment import Treatment, treatment_medical_codes
+from app.models.transcription_segment import TranscriptionSegment
+from app.models.treatment import Treatment, TreatmentMedicalCode, treatment_medical_codes
 from app.models.medical_code import MedicalCode, CodeSystem
 
 # Export all models and enums
@@ -22,7 +23,9 @@ __all__ = [
     "Patient",
     "Recording",
     "Transcription",
+    "TranscriptionSegment",
     "Treatment",
+    "TreatmentMedicalCode",
     "MedicalCode",
     
     # Enums
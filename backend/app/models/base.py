@@ -3,30 +3,30 @@ Database base configuration and common mixins
 """
 
 from datetime import datetime
-from typing import Any
 
-from sqlalchemy import Column, DateTime, Integer
-from sqlalchemy.ext.declarative import as_declarative, declared_attr
+from sqlalchemy import JSON, DateTime, Integer, event, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, mapped_column
 
+# Binary JSONB on PostgreSQL (parsed once on write, GIN-indexable, supports
+# containment via .contains()); plain JSON on SQLite dev databases
+JSONType = JSONB().with_variant(JSON(), "sqlite")
 
-@as_declarative()
-class Base:
+
+class Base(DeclarativeBase):
     """Base class for all database models"""
     
-    id: Any
-    __name__: str
-    
     # Generate __tablename__ automatically
-    @declared_attr
+    @declared_attr.directive
     def __tablename__(cls) -> str:
         return cls.__name__.lower()
 
 
 class TimestampMixin:
-    """Mixin that adds timestamp fields to models"""
+    """Mixin that adds timestamp fields to models (UTC timestamptz, set by the database)"""
     
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
 
 class BaseModel(Base, TimestampMixin):
@@ -34,4 +34,22 @@ class BaseModel(Base, TimestampMixin):
     
     __abstract__ = True
     
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True) 
\ No newline at end of file
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    
+    # Names of functools.cached_property attributes derived from columns;
+    # dropped whenever the instance is expired or refreshed from the database
+    __cached_properties__: tuple = ()
+    
+    def _clear_cached_properties(self) -> None:
+        for name in self.__cached_properties__:
+            self.__dict__.pop(name, None)
+
+
+@event.listens_for(BaseModel, "expire", propagate=True)
+def _clear_cached_on_expire(target, attrs):
+    target._clear_cached_properties()
+
+
+@event.listens_for(BaseModel, "refresh", propagate=True)
+def _clear_cached_on_refresh(target, context, attrs):
+    target._clear_cached_properties()
@@ -2,12 +2,19 @@
 Medical code model for GOZ/BEMA codes
 """
 
-from sqlalchemy import Column, String, Text, Float, Boolean, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Optional
+from sqlalchemy import Computed, String, Text, Float, Boolean, Index, Select, func, select, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Mapped, WriteOnlyMapped, mapped_column, relationship, validates
+from sqlalchemy.schema import CreateColumn
 import enum
 
 from app.models.base import BaseModel
-from app.models.treatment import treatment_medical_codes
+
+if TYPE_CHECKING:
+    from app.models.treatment import TreatmentMedicalCode
 
 
 class CodeSystem(enum.Enum):
@@ -20,43 +27,91 @@ class MedicalCode(BaseModel):
     """Medical codes for dental procedures (GOZ/BEMA)"""
     
     __tablename__ = "medical_codes"
+    __cached_properties__ = ("full_code",)
     
     # Code identification
-    code = Column(String(20), nullable=False, index=True)
-    system = Column(SQLEnum(CodeSystem), nullable=False)
+    code: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
+    system: Mapped[CodeSystem] = mapped_column(SQLEnum(CodeSystem, name="codesystem", native_enum=True), nullable=False)  # Native PostgreSQL ENUM
     
     # Code description
-    name = Column(String(200), nullable=False)
-    description = Column(Text, nullable=True)
+    name: Mapped[str] = mapped_column(String(200), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Financial information
-    base_points = Column(Float, nullable=True)  # Points value for BEMA
-    base_fee = Column(Float, nullable=True)  # Base fee for GOZ
+    base_points: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # Points value for BEMA
+    base_fee: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # Base fee for GOZ
     
     # Categorization
-    category = Column(String(100), nullable=True)  # e.g., "Konservierende Zahnheilkunde"
-    subcategory = Column(String(100), nullable=True)  # e.g., "Füllungen"
+    category: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # e.g., "Konservierende Zahnheilkunde"
+    subcategory: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # e.g., "Füllungen"
     
     # Metadata
-    is_active = Column(Boolean, default=True, nullable=False)
-    valid_from = Column(String(10), nullable=True)  # YYYY-MM-DD
-    valid_until = Column(String(10), nullable=True)  # YYYY-MM-DD
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    valid_from: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)  # YYYY-MM-DD
+    valid_until: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)  # YYYY-MM-DD
     
     # Search optimization
-    search_terms = Column(Text, nullable=True)  # Comma-separated search terms
-    
-    # Relationships
-    treatments = relationship(
-        "Treatment",
-        secondary=treatment_medical_codes,
-        back_populates="medical_codes",
-        lazy="dynamic"
+    search_terms: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Comma-separated search terms
+    
+    # Full-text index over name, description and search terms (PostgreSQL only;
+    # German stemming so "Füllungen" matches "Füllung"). Deferred so plain
+    # loads never select it.
+    search_vector: Mapped[Optional[Any]] = mapped_column(
+        TSVECTOR().with_variant(Text(), "sqlite"),
+        Computed(
+            "to_tsvector('german', coalesce(name, '') || ' ' || "
+            "coalesce(description, '') || ' ' || coalesce(search_terms, ''))",
+            persisted=True,
+        ),
+        nullable=True,
+        deferred=True,
+    )
+    
+    __table_args__ = (
+        # Code lookups are always scoped to a code system (GOZ or BEMA)
+        Index("ix_medical_codes_system_code", "system", "code", unique=True),
+        Index("ix_medical_codes_system_category_active", "system", "category", "is_active"),
+        Index("ix_medical_codes_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    
+    # Relationships (every treatment ever billed with this code; query it
+    # explicitly via select(TreatmentMedicalCode) rather than loading the collection)
+    treatment_links: WriteOnlyMapped["TreatmentMedicalCode"] = relationship(
+        back_populates="medical_code",
+        lazy="write_only",
+        passive_deletes=True
     )
     
     def __repr__(self) -> str:
         return f"<MedicalCode {self.system.value} {self.code} - {self.name}>"
     
-    @property
+    @classmethod
+    def search(cls, query: str, limit: int = 20) -> Select:
+        """Build a ranked full-text search over active codes (PostgreSQL only)"""
+        ts_query = func.plainto_tsquery("german", query)
+        return (
+            select(cls)
+            .where(cls.is_active.is_(True), cls.search_vector.op("@@")(ts_query))
+            .order_by(func.ts_rank_cd(cls.search_vector, ts_query).desc())
+            .limit(limit)
+        )
+    
+    @validates("code", "system")
+    def _reset_full_code(self, key, value):
+        """Drop the cached full_code when one of its parts changes"""
+        self.__dict__.pop("full_code", None)
+        return value
+    
+    @cached_property
     def full_code(self) -> str:
         """Return formatted code with system prefix"""
-        return f"{self.system.value.upper()} {self.code}" 
\ No newline at end of file
+        return f"{self.system.value.upper()} {self.code}"
+
+
+@compiles(CreateColumn, "sqlite")
+def _create_column_sqlite(element, compiler, **kw):
+    """SQLite has no to_tsvector, so create search_vector there as a plain column"""
+    column = element.element
+    if column.table is not None and column.table.name == "medical_codes" and column.name == "search_vector":
+        return f"{compiler.preparer.format_column(column)} TEXT"
+    return compiler.visit_create_column(element, **kw)
@@ -3,12 +3,21 @@ Patient model for dental practice
 """
 
 from datetime import date
-from sqlalchemy import Column, String, Date, Text, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from functools import cached_property
+from typing import TYPE_CHECKING, List, Optional
+from sqlalchemy import Index, Integer, String, Date, Text, text, Enum as SQLEnum
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
+from sqlalchemy.sql.functions import FunctionElement
 import enum
 
 from app.models.base import BaseModel
 
+if TYPE_CHECKING:
+    from app.models.recording import Recording
+    from app.models.treatment import Treatment
+
 
 class Gender(enum.Enum):
     """Patient gender options"""
@@ -24,53 +33,93 @@ class InsuranceType(enum.Enum):
     SELF_PAY = "self_pay"  # Selbstzahler
 
 
+class age_in_years(FunctionElement):
+    """Full years elapsed since a date, computed in the database"""
+    type = Integer()
+    inherit_cache = True
+
+
+@compiles(age_in_years, "postgresql")
+def _age_in_years_postgresql(element, compiler, **kw):
+    return f"CAST(date_part('year', age({compiler.process(element.clauses, **kw)})) AS INTEGER)"
+
+
+@compiles(age_in_years, "sqlite")
+def _age_in_years_sqlite(element, compiler, **kw):
+    born = compiler.process(element.clauses, **kw)
+    return (
+        f"(CAST(strftime('%Y', 'now') AS INTEGER) - CAST(strftime('%Y', {born}) AS INTEGER)"
+        f" - (strftime('%m-%d', 'now') < strftime('%m-%d', {born})))"
+    )
+
+
 class Patient(BaseModel):
     """Patient model with dental practice specific fields"""
     
     __tablename__ = "patients"
+    __table_args__ = (
+        # Unique only among synced patients; unsynced (NULL) rows stay out of the index
+        Index("uq_patients_evident_patient_id", "evident_patient_id", unique=True,
+              postgresql_where=text("evident_patient_id IS NOT NULL"),
+              sqlite_where=text("evident_patient_id IS NOT NULL")),
+    )
+    __cached_properties__ = ("full_name",)
     
     # Personal information
-    first_name = Column(String(100), nullable=False)
-    last_name = Column(String(100), nullable=False)
-    date_of_birth = Column(Date, nullable=False)
-    gender = Column(SQLEnum(Gender), nullable=False)
+    first_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    last_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    date_of_birth: Mapped[date] = mapped_column(Date, nullable=False)
+    gender: Mapped[Gender] = mapped_column(SQLEnum(Gender, name="gender", native_enum=True), nullable=False)
     
     # Contact information
-    email = Column(String(255), nullable=True)
-    phone = Column(String(50), nullable=True)
-    mobile = Column(String(50), nullable=True)
+    email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    phone: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    mobile: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     
     # Address
-    street = Column(String(200), nullable=True)
-    house_number = Column(String(20), nullable=True)
-    postal_code = Column(String(10), nullable=True)
-    city = Column(String(100), nullable=True)
+    street: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    house_number: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    postal_code: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
+    city: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     
     # Insurance information
-    insurance_type = Column(SQLEnum(InsuranceType), default=InsuranceType.PUBLIC, nullable=False)
-    insurance_company = Column(String(100), nullable=True)
-    insurance_number = Column(String(50), nullable=True)
+    insurance_type: Mapped[InsuranceType] = mapped_column(SQLEnum(InsuranceType, name="insurancetype", native_enum=True), default=InsuranceType.PUBLIC, nullable=False)
+    insurance_company: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    insurance_number: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     
     # Medical information
-    allergies = Column(Text, nullable=True)
-    medications = Column(Text, nullable=True)
-    medical_notes = Column(Text, nullable=True)
+    allergies: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    medications: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    medical_notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # External system IDs
-    evident_patient_id = Column(String(50), nullable=True, unique=True, index=True)
+    evident_patient_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     
-    # Relationships
-    recordings = relationship("Recording", back_populates="patient", lazy="dynamic")
-    treatments = relationship("Treatment", back_populates="patient", lazy="dynamic")
+    # Relationships (a patient's history is usually read as a whole; queries
+    # that only need patient rows, e.g. search lists, should pass
+    # noload(Patient.recordings, Patient.treatments) or raiseload("*").
+    # Deleting a patient cascades in the database via ON DELETE CASCADE)
+    recordings: Mapped[List["Recording"]] = relationship(
+        back_populates="patient", lazy="selectin", cascade="all, delete-orphan", passive_deletes=True
+    )
+    treatments: Mapped[List["Treatment"]] = relationship(
+        back_populates="patient", lazy="selectin", cascade="all, delete-orphan", passive_deletes=True
+    )
     
-    @property
+    @validates("first_name", "last_name")
+    def _reset_full_name(self, key, value):
+        """Drop the cached full_name when one of its parts changes"""
+        self.__dict__.pop("full_name", None)
+        return value
+    
+    @cached_property
     def full_name(self) -> str:
         """Return patient's full name"""
         return f"{self.first_name} {self.last_name}"
     
-    @property
+    @hybrid_property
     def age(self) -> int:
-        """Calculate patient's age"""
+        """Calculate patient's age (usable in queries, e.g. where(Patient.age > 65))"""
         if not self.date_of_birth:
             return 0
         today = date.today()
@@ -81,5 +130,10 @@ class Patient(BaseModel):
             age -= 1
         return age
     
+    @age.inplace.expression
+    @classmethod
+    def _age_expression(cls):
+        return age_in_years(cls.date_of_birth)
+    
     def __repr__(self) -> str:
         return f"<Patient {self.full_name} - {self.insurance_type.value}>" 
\ No newline at end of file
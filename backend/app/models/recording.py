@@ -2,12 +2,18 @@
 Recording model for audio recordings
 """
 
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, Text, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy import String, Integer, Float, ForeignKey, Text, Index, Enum as SQLEnum
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
 from app.models.base import BaseModel
 
+if TYPE_CHECKING:
+    from app.models.patient import Patient
+    from app.models.transcription import Transcription
+    from app.models.user import User
+
 
 class RecordingStatus(enum.Enum):
     """Recording processing status"""
@@ -22,31 +28,46 @@ class Recording(BaseModel):
     """Audio recording model"""
     
     __tablename__ = "recordings"
+    __table_args__ = (
+        # Recording queues per patient / per dentist filtered by status
+        Index("ix_recordings_patient_status", "patient_id", "status"),
+        Index("ix_recordings_created_by_status", "created_by_id", "status"),
+        # Append-mostly: a BRIN index keeps "recordings this week" range scans
+        # cheap at a fraction of a btree's size (table also uses fillfactor=70
+        # so status/error_message updates stay HOT; set in the migration)
+        Index("ix_recordings_created_at_brin", "created_at", postgresql_using="brin",
+              postgresql_with={"pages_per_range": 32}),
+    )
     
+    # Cold columns sit in the "audio_meta" deferred group so status lists only
+    # load the narrow hot row; detail views use undefer_group("audio_meta").
     # File information
-    filename = Column(String(255), nullable=False)
-    file_path = Column(String(500), nullable=False)
-    file_size = Column(Integer, nullable=False)  # Size in bytes
-    duration = Column(Float, nullable=True)  # Duration in seconds
-    format = Column(String(10), nullable=False)  # wav, mp3, etc.
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    file_path: Mapped[str] = mapped_column(String(500), nullable=False, deferred=True, deferred_group="audio_meta")
+    file_size: Mapped[int] = mapped_column(Integer, nullable=False)  # Size in bytes
+    duration: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # Duration in seconds
+    format: Mapped[str] = mapped_column(String(10), nullable=False)  # wav, mp3, etc.
     
     # Recording metadata
-    status = Column(SQLEnum(RecordingStatus), default=RecordingStatus.PENDING, nullable=False)
-    error_message = Column(Text, nullable=True)
+    # Native PostgreSQL ENUM (4 bytes per row, integer comparisons)
+    status: Mapped[RecordingStatus] = mapped_column(SQLEnum(RecordingStatus, name="recordingstatus", native_enum=True), default=RecordingStatus.PENDING, nullable=False)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True, deferred_group="audio_meta")
     
     # Audio metadata
-    sample_rate = Column(Integer, nullable=True)
-    channels = Column(Integer, nullable=True)
-    bitrate = Column(Integer, nullable=True)
+    sample_rate: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, deferred=True, deferred_group="audio_meta")
+    channels: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, deferred=True, deferred_group="audio_meta")
+    bitrate: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, deferred=True, deferred_group="audio_meta")
     
     # Foreign keys
-    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
-    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    patient_id: Mapped[int] = mapped_column(Integer, ForeignKey("patients.id", ondelete="CASCADE"), nullable=False)
+    created_by_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Relationships
-    patient = relationship("Patient", back_populates="recordings")
-    created_by = relationship("User", back_populates="recordings")
-    transcription = relationship("Transcription", back_populates="recording", uselist=False)
+    patient: Mapped["Patient"] = relationship(back_populates="recordings")
+    created_by: Mapped["User"] = relationship(back_populates="recordings")
+    transcription: Mapped[Optional["Transcription"]] = relationship(
+        back_populates="recording", uselist=False, cascade="all, delete-orphan", passive_deletes=True
+    )
     
     def __repr__(self) -> str:
         return f"<Recording {self.filename} - {self.status.value}>" 
\ No newline at end of file
@@ -2,38 +2,56 @@
 Transcription model for storing transcribed text from recordings
 """
 
-from sqlalchemy import Column, String, Text, ForeignKey, Float, JSON, Integer
-from sqlalchemy.orm import relationship
+from typing import TYPE_CHECKING, Any, List, Optional
+from sqlalchemy import String, Text, ForeignKey, Float, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import BaseModel
+from app.models.base import BaseModel, JSONType
+
+if TYPE_CHECKING:
+    from app.models.recording import Recording
+    from app.models.transcription_segment import TranscriptionSegment
+    from app.models.treatment import Treatment
 
 
 class Transcription(BaseModel):
     """Transcription model for audio-to-text conversions"""
     
     __tablename__ = "transcriptions"
+    __table_args__ = (
+        Index("ix_transcriptions_created_at_brin", "created_at", postgresql_using="brin",
+              postgresql_with={"pages_per_range": 32}),
+    )
     
     # Transcription content
-    text = Column(Text, nullable=False)
-    language = Column(String(10), default="de", nullable=False)  # ISO language code
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    language: Mapped[str] = mapped_column(String(10), default="de", nullable=False)  # ISO language code
     
     # Transcription metadata
-    model_used = Column(String(50), nullable=True)  # e.g., "whisper-large"
-    confidence_score = Column(Float, nullable=True)  # Overall confidence 0-1
-    processing_time = Column(Float, nullable=True)  # Time taken in seconds
+    model_used: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # e.g., "whisper-large"
+    confidence_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # Overall confidence 0-1
+    processing_time: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # Time taken in seconds
     
-    # Segments with timestamps (for future word-level highlighting)
-    segments = Column(JSON, nullable=True)  # Array of {text, start, end, confidence}
+    # Segments with timestamps (for future word-level highlighting). The large
+    # JSON columns load only on request via undefer_group("details"); this is
+    # the playback snapshot, queries go through segment_rows
+    segments: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True, deferred=True, deferred_group="details")  # Array of {text, start, end, confidence}
     
     # Medical terms detected
-    medical_terms = Column(JSON, nullable=True)  # Array of detected medical terms
+    medical_terms: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True, deferred=True, deferred_group="details")  # Array of detected medical terms
     
     # Foreign key
-    recording_id = Column(Integer, ForeignKey("recordings.id"), unique=True, nullable=False)
+    recording_id: Mapped[int] = mapped_column(Integer, ForeignKey("recordings.id", ondelete="CASCADE"), unique=True, nullable=False)
     
     # Relationships
-    recording = relationship("Recording", back_populates="transcription")
-    treatment = relationship("Treatment", back_populates="transcription", uselist=False)
+    recording: Mapped["Recording"] = relationship(back_populates="transcription")
+    treatment: Mapped[Optional["Treatment"]] = relationship(back_populates="transcription", uselist=False, passive_deletes=True)
+    segment_rows: Mapped[List["TranscriptionSegment"]] = relationship(
+        back_populates="transcription",
+        order_by="TranscriptionSegment.start_ms",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
     
     def __repr__(self) -> str:
         text_preview = self.text[:50] + "..." if len(self.text) > 50 else self.text
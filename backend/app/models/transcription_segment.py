@@ -0,0 +1,63 @@
+"""
+Transcription segment model for per-segment timing and confidence
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List
+from sqlalchemy import Float, ForeignKey, Index, Integer, Text, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import BaseModel
+
+if TYPE_CHECKING:
+    from app.models.transcription import Transcription
+
+# Segments below this confidence are flagged for review
+LOW_CONFIDENCE_THRESHOLD = 0.55
+
+
+class TranscriptionSegment(BaseModel):
+    """One timed segment of a transcription, normalized for indexed queries"""
+    
+    __tablename__ = "transcription_segments"
+    __table_args__ = (
+        Index("ix_transcription_segments_transcription_start", "transcription_id", "start_ms"),
+        # Partial index: "flag low-confidence segments" is a range scan over
+        # only the rows that matter
+        Index(
+            "ix_transcription_segments_low_confidence",
+            "confidence",
+            postgresql_where=text(f"confidence < {LOW_CONFIDENCE_THRESHOLD}"),
+            sqlite_where=text(f"confidence < {LOW_CONFIDENCE_THRESHOLD}"),
+        ),
+    )
+    
+    transcription_id: Mapped[int] = mapped_column(Integer, ForeignKey("transcriptions.id", ondelete="CASCADE"), nullable=False)
+    start_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    end_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    confidence: Mapped[float] = mapped_column(Float, nullable=False)  # 0-1
+    
+    # Relationships
+    transcription: Mapped["Transcription"] = relationship(back_populates="segment_rows")
+    
+    @staticmethod
+    def rows_from_segments(transcription_id: int, segments: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert transcription segments ({start, end, text, confidence} with
+        seconds and Whisper avg_logprob) into rows for a bulk
+        session.execute(insert(TranscriptionSegment), rows).
+        """
+        return [
+            {
+                "transcription_id": transcription_id,
+                "start_ms": round(seg["start"] * 1000),
+                "end_ms": round(seg["end"] * 1000),
+                "text": seg["text"],
+                # Same logprob -> 0-1 mapping as the overall transcription confidence
+                "confidence": min(1.0, max(0.0, seg.get("confidence", -0.5) + 1.0)),
+            }
+            for seg in segments
+        ]
+    
+    def __repr__(self) -> str:
+        return f"<TranscriptionSegment {self.start_ms}-{self.end_ms}ms ({self.confidence:.2f})>"
@@ -3,65 +3,142 @@ Treatment model for dental procedures and treatments
 """
 
 from datetime import datetime
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Float, JSON, Table, Integer
-from sqlalchemy.orm import relationship
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from sqlalchemy import CheckConstraint, JSON, SmallInteger, String, Text, ForeignKey, DateTime, Float, Integer, Index, func, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
-from app.models.base import BaseModel, Base
+from app.models.base import BaseModel, Base, JSONType
 
+if TYPE_CHECKING:
+    from app.models.medical_code import MedicalCode
+    from app.models.patient import Patient
+    from app.models.transcription import Transcription
+    from app.models.user import User
 
-# Association table for many-to-many relationship between treatments and medical codes
-treatment_medical_codes = Table(
-    'treatment_medical_codes',
-    Base.metadata,
-    Column('treatment_id', ForeignKey('treatments.id'), primary_key=True),
-    Column('medical_code_id', ForeignKey('medical_codes.id'), primary_key=True),
-    Column('quantity', Float, default=1.0),  # How many times this code was applied
-    Column('notes', Text, nullable=True)
+# FDI tooth numbers: quadrants 1-4 hold permanent teeth 1-8, quadrants 5-8
+# deciduous teeth 1-5
+FDI_TOOTH_NUMBERS = frozenset(
+    [quadrant * 10 + tooth for quadrant in range(1, 5) for tooth in range(1, 9)]
+    + [quadrant * 10 + tooth for quadrant in range(5, 9) for tooth in range(1, 6)]
 )
 
 
+class TreatmentMedicalCode(Base):
+    """Association object linking a treatment to a billed medical code"""
+    
+    __tablename__ = "treatment_medical_codes"
+    
+    treatment_id: Mapped[int] = mapped_column(ForeignKey("treatments.id", ondelete="CASCADE"), primary_key=True)
+    medical_code_id: Mapped[int] = mapped_column(ForeignKey("medical_codes.id", ondelete="CASCADE"), primary_key=True)
+    quantity: Mapped[Optional[float]] = mapped_column(Float, default=1.0, nullable=True)  # How many times this code was applied
+    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
+    # Relationships
+    treatment: Mapped["Treatment"] = relationship(back_populates="code_links")
+    medical_code: Mapped["MedicalCode"] = relationship(back_populates="treatment_links", lazy="selectin")
+    
+    @staticmethod
+    def rows_for_codes(treatment_id: int, quantities: Dict[int, float]) -> List[Dict[str, Any]]:
+        """
+        Convert {medical_code_id: quantity} into rows for a bulk
+        session.execute(insert(TreatmentMedicalCode), rows).
+        """
+        return [
+            {"treatment_id": treatment_id, "medical_code_id": code_id, "quantity": quantity}
+            for code_id, quantity in quantities.items()
+        ]
+    
+    def __repr__(self) -> str:
+        return f"<TreatmentMedicalCode {self.treatment_id}:{self.medical_code_id} x{self.quantity}>"
+
+
+# Core table for bulk statements against the association
+treatment_medical_codes = TreatmentMedicalCode.__table__
+
+
 class Treatment(BaseModel):
     """Treatment model for dental procedures"""
     
     __tablename__ = "treatments"
     
     # Treatment information
-    treatment_date = Column(DateTime, default=datetime.utcnow, nullable=False)
-    tooth_numbers = Column(JSON, nullable=True)  # Array of tooth numbers [14, 15, 16]
-    diagnosis = Column(Text, nullable=False)
-    treatment_description = Column(Text, nullable=False)
+    treatment_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    tooth_numbers: Mapped[Optional[List[int]]] = mapped_column(
+        ARRAY(SmallInteger).with_variant(JSON(), "sqlite"), nullable=True
+    )  # FDI tooth numbers [14, 15, 16]
+    diagnosis: Mapped[str] = mapped_column(Text, nullable=False)
+    treatment_description: Mapped[str] = mapped_column(Text, nullable=False)
     
     # Treatment planning
-    treatment_plan = Column(Text, nullable=True)
-    next_appointment = Column(DateTime, nullable=True)
+    treatment_plan: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    next_appointment: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     
     # Financial information
-    total_cost = Column(Float, nullable=True)
-    insurance_coverage = Column(Float, nullable=True)
-    patient_payment = Column(Float, nullable=True)
+    total_cost: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    insurance_coverage: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    patient_payment: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     
     # Documentation
-    notes = Column(Text, nullable=True)
-    images = Column(JSON, nullable=True)  # Array of image URLs/paths
+    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    images: Mapped[Optional[Any]] = mapped_column(JSONType, nullable=True)  # Array of image URLs/paths
     
     # Foreign keys
-    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
-    performed_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    transcription_id = Column(Integer, ForeignKey("transcriptions.id"), nullable=True, unique=True)
+    patient_id: Mapped[int] = mapped_column(Integer, ForeignKey("patients.id", ondelete="CASCADE"), nullable=False)
+    performed_by_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    transcription_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("transcriptions.id", ondelete="SET NULL"), nullable=True, unique=True)
     
     # External system IDs
-    evident_treatment_id = Column(String(50), nullable=True, unique=True, index=True)
+    evident_treatment_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    
+    __table_args__ = (
+        # Patient history, newest treatment first
+        Index("ix_treatments_patient_date", patient_id, treatment_date.desc()),
+        # Containment lookups, e.g. where(Treatment.tooth_numbers.contains([36]))
+        Index("ix_treatments_tooth_numbers_gin", "tooth_numbers", postgresql_using="gin"),
+        # SQLite stores the numbers as JSON and relies on the validator alone
+        CheckConstraint(
+            f"tooth_numbers <@ ARRAY{sorted(FDI_TOOTH_NUMBERS)}::smallint[]",
+            name="ck_treatments_tooth_numbers_fdi",
+        ).ddl_if(dialect="postgresql"),
+        # Unique only among synced treatments; NULL rows stay out of the index
+        Index("uq_treatments_evident_treatment_id", "evident_treatment_id", unique=True,
+              postgresql_where=text("evident_treatment_id IS NOT NULL"),
+              sqlite_where=text("evident_treatment_id IS NOT NULL")),
+        # Treatment dates grow with insertion order, so a BRIN index serves range scans
+        Index("ix_treatments_treatment_date_brin", "treatment_date", postgresql_using="brin",
+              postgresql_with={"pages_per_range": 32}),
+    )
     
     # Relationships
-    patient = relationship("Patient", back_populates="treatments")
-    performed_by = relationship("User", back_populates="treatments")
-    transcription = relationship("Transcription", back_populates="treatment")
-    medical_codes = relationship(
-        "MedicalCode",
-        secondary=treatment_medical_codes,
-        back_populates="treatments",
-        lazy="dynamic"
+    patient: Mapped["Patient"] = relationship(back_populates="treatments")
+    performed_by: Mapped["User"] = relationship(back_populates="treatments")
+    transcription: Mapped[Optional["Transcription"]] = relationship(back_populates="treatment")
+    code_links: Mapped[List["TreatmentMedicalCode"]] = relationship(
+        back_populates="treatment",
+        lazy="selectin",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+    
+    # Billed codes without the quantity/notes wrapper; appending a code links it with quantity 1
+    medical_codes: AssociationProxy[List["MedicalCode"]] = association_proxy(
+        "code_links",
+        "medical_code",
+        creator=lambda medical_code: TreatmentMedicalCode(medical_code=medical_code),
     )
     
+    @validates("tooth_numbers")
+    def _coerce_tooth_numbers(self, key, value):
+        """Store FDI tooth numbers as integers (extraction yields strings like "36")"""
+        if value is None:
+            return None
+        numbers = [int(number) for number in value]
+        invalid = [number for number in numbers if number not in FDI_TOOTH_NUMBERS]
+        if invalid:
+            raise ValueError(f"Invalid FDI tooth numbers: {invalid}")
+        return numbers
+    
     def __repr__(self) -> str:
         return f"<Treatment {self.treatment_date} - {self.diagnosis[:30]}...>" 
\ No newline at end of file
@@ -2,12 +2,18 @@
 User model for authentication and authorization
 """
 
-from sqlalchemy import Boolean, Column, String, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from functools import cached_property
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy import Boolean, String, Enum as SQLEnum
+from sqlalchemy.orm import Mapped, WriteOnlyMapped, mapped_column, relationship, validates
 import enum
 
 from app.models.base import BaseModel
 
+if TYPE_CHECKING:
+    from app.models.recording import Recording
+    from app.models.treatment import Treatment
+
 
 class UserRole(enum.Enum):
     """User roles in the system"""
@@ -21,29 +27,37 @@ class User(BaseModel):
     """User model for dental practice staff"""
     
     __tablename__ = "users"
+    __cached_properties__ = ("full_name",)
     
     # Authentication fields
-    email = Column(String(255), unique=True, index=True, nullable=False)
-    hashed_password = Column(String(255), nullable=False)
+    email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
+    hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     
     # Profile fields
-    first_name = Column(String(100), nullable=False)
-    last_name = Column(String(100), nullable=False)
-    role = Column(SQLEnum(UserRole), default=UserRole.DENTIST, nullable=False)
+    first_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    last_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    role: Mapped[UserRole] = mapped_column(SQLEnum(UserRole, name="userrole", native_enum=True), default=UserRole.DENTIST, nullable=False)
     
     # Status fields
-    is_active = Column(Boolean, default=True, nullable=False)
-    is_superuser = Column(Boolean, default=False, nullable=False)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    is_superuser: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     
     # Professional fields
-    license_number = Column(String(50), nullable=True)  # For dentists
-    specialization = Column(String(100), nullable=True)  # e.g., "Orthodontics"
+    license_number: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # For dentists
+    specialization: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # e.g., "Orthodontics"
+    
+    # Relationships (grow with every visit a dentist handles, so never loaded
+    # implicitly; query them explicitly via select())
+    recordings: WriteOnlyMapped["Recording"] = relationship(back_populates="created_by", lazy="write_only")
+    treatments: WriteOnlyMapped["Treatment"] = relationship(back_populates="performed_by", lazy="write_only")
     
-    # Relationships
-    recordings = relationship("Recording", back_populates="created_by", lazy="dynamic")
-    treatments = relationship("Treatment", back_populates="performed_by", lazy="dynamic")
+    @validates("first_name", "last_name")
+    def _reset_full_name(self, key, value):
+        """Drop the cached full_name when one of its parts changes"""
+        self.__dict__.pop("full_name", None)
+        return value
     
-    @property
+    @cached_property
     def full_name(self) -> str:
         """Return user's full name"""
         return f"{self.first_name} {self.last_name}"
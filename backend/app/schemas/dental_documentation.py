@@ -3,10 +3,14 @@ Dental Documentation JSON Schemas
 Core data structures for mapping speech-to-text into structured dental documentation
 """
 
+from bisect import bisect_right
+from functools import cache
+from pathlib import Path
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel, Field, validator
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class TreatmentType(str, Enum):
@@ -44,6 +48,30 @@ class ConfidenceLevel(str, Enum):
     UNSURE = "unsure"  # <50% confidence
 
 
+# Numeric score per level, and the score thresholds separating the levels
+CONFIDENCE_SCORES = {
+    ConfidenceLevel.HIGH: 1.0,
+    ConfidenceLevel.MEDIUM: 0.8,
+    ConfidenceLevel.LOW: 0.6,
+    ConfidenceLevel.UNSURE: 0.4,
+}
+CONFIDENCE_THRESHOLDS = (0.5, 0.7, 0.9)
+CONFIDENCE_BY_RANK = (ConfidenceLevel.UNSURE, ConfidenceLevel.LOW, ConfidenceLevel.MEDIUM, ConfidenceLevel.HIGH)
+
+# OpenAPI examples per schema class, read only when a JSON schema is rendered
+EXAMPLES_FILE = Path(__file__).parent / "examples" / "dental_documentation.json"
+
+
+@cache
+def _load_examples() -> Dict[str, Any]:
+    return orjson.loads(EXAMPLES_FILE.read_bytes())
+
+
+def _schema_example(schema: Dict[str, Any], model: type) -> None:
+    """Attach the model's example to its generated JSON schema"""
+    schema["example"] = _load_examples()[model.__name__]
+
+
 class DentalFinding(BaseModel):
     """Individual dental finding/diagnosis"""
     
@@ -53,16 +81,7 @@ class DentalFinding(BaseModel):
     severity: Optional[str] = Field(None, description="Severity level if applicable")
     confidence: ConfidenceLevel = Field(ConfidenceLevel.MEDIUM, description="AI confidence level")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "tooth_number": "36",
-                "surface": "okklusal",
-                "diagnosis": "Karies profunda",
-                "severity": "tief",
-                "confidence": "high"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_schema_example)
 
 
 class BillingCode(BaseModel):
@@ -77,19 +96,7 @@ class BillingCode(BaseModel):
     tooth_number: Optional[str] = Field(None, description="Related tooth if applicable")
     confidence: ConfidenceLevel = Field(ConfidenceLevel.MEDIUM, description="AI confidence level")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "code": "GOZ 2080",
-                "system": "goz",
-                "description": "Füllung einflächig",
-                "factor": 2.3,
-                "points": 48,
-                "fee_euros": 26.40,
-                "tooth_number": "36",
-                "confidence": "high"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_schema_example)
 
 
 class TreatmentPlan(BaseModel):
@@ -101,16 +108,7 @@ class TreatmentPlan(BaseModel):
     follow_up_weeks: Optional[int] = Field(None, description="Follow-up period in weeks")
     notes: Optional[str] = Field(None, description="Additional notes")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "recommendation": "Wurzelkanalbehandlung Zahn 36",
-                "priority": "urgent",
-                "estimated_sessions": 3,
-                "follow_up_weeks": 2,
-                "notes": "Röntgenkontrolle erforderlich"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_schema_example)
 
 
 class AudioMetadata(BaseModel):
@@ -122,16 +120,7 @@ class AudioMetadata(BaseModel):
     size_bytes: int = Field(..., description="File size in bytes")
     quality_score: Optional[float] = Field(None, description="Audio quality score 0-1")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "duration_seconds": 45.2,
-                "sample_rate": 16000,
-                "format": "wav",
-                "size_bytes": 1440000,
-                "quality_score": 0.95
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_schema_example)
 
 
 class TranscriptionResult(BaseModel):
@@ -144,16 +133,7 @@ class TranscriptionResult(BaseModel):
     processing_time_ms: int = Field(..., description="Processing time in milliseconds")
     stt_model: str = Field("whisper-base", description="STT model used")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "text": "Zahn drei sechs okklusal Karies profunda, Füllung Komposit gelegt",
-                "language": "de",
-                "confidence": 0.92,
-                "processing_time_ms": 3200,
-                "stt_model": "whisper-base"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_schema_example)
 
 
 class DentalDocumentation(BaseModel):
@@ -190,110 +170,50 @@ class DentalDocumentation(BaseModel):
     exported_to_evident: bool = Field(False, description="Exported to Evident PMS")
     export_timestamp: Optional[datetime] = Field(None, description="Export timestamp")
     
-    @validator('overall_confidence', always=True)
-    def calculate_overall_confidence(cls, v, values):
-        """Calculate overall confidence based on transcription and extracted data"""
-        transcription = values.get('transcription')
-        billing_codes = values.get('billing_codes', [])
+    @model_validator(mode='after')
+    def assess_confidence_and_review(self) -> 'DentalDocumentation':
+        """Derive overall confidence and the review flag from the validated fields"""
+        # One pass over the billing codes collects everything both checks need
+        code_score = 0.0
+        max_fee = 0.0
+        for code in self.billing_codes:
+            code_score += CONFIDENCE_SCORES[code.confidence]
+            if code.fee_euros and code.fee_euros > max_fee:
+                max_fee = code.fee_euros
         
-        if not transcription:
-            return ConfidenceLevel.LOW
-            
+        self.overall_confidence = self._calculate_overall_confidence(code_score)
+        self.requires_review = self._determine_review_requirement(max_fee)
+        return self
+    
+    def _calculate_overall_confidence(self, code_score: float) -> ConfidenceLevel:
+        """Calculate overall confidence based on transcription and extracted data"""
         # Base confidence on transcription quality
-        base_confidence = transcription.confidence
+        base_confidence = self.transcription.confidence
         
-        # Adjust based on billing code confidence
-        if billing_codes:
-            avg_code_confidence = sum(
-                1.0 if code.confidence == ConfidenceLevel.HIGH else
-                0.8 if code.confidence == ConfidenceLevel.MEDIUM else
-                0.6 if code.confidence == ConfidenceLevel.LOW else 0.4
-                for code in billing_codes
-            ) / len(billing_codes)
-            base_confidence = (base_confidence + avg_code_confidence) / 2
+        # Adjust based on average billing code confidence
+        if self.billing_codes:
+            base_confidence = (base_confidence + code_score / len(self.billing_codes)) / 2
         
-        # Convert to confidence level
-        if base_confidence >= 0.9:
-            return ConfidenceLevel.HIGH
-        elif base_confidence >= 0.7:
-            return ConfidenceLevel.MEDIUM
-        elif base_confidence >= 0.5:
-            return ConfidenceLevel.LOW
-        else:
-            return ConfidenceLevel.UNSURE
+        # Convert to confidence level (>= 0.9 high, >= 0.7 medium, >= 0.5 low)
+        return CONFIDENCE_BY_RANK[bisect_right(CONFIDENCE_THRESHOLDS, base_confidence)]
     
-    @validator('requires_review', always=True)
-    def determine_review_requirement(cls, v, values):
+    def _determine_review_requirement(self, max_fee: float) -> bool:
         """Determine if manual review is required"""
-        overall_confidence = values.get('overall_confidence', ConfidenceLevel.LOW)
-        billing_codes = values.get('billing_codes', [])
-        
         # Require review for low confidence
-        if overall_confidence in [ConfidenceLevel.LOW, ConfidenceLevel.UNSURE]:
+        if self.overall_confidence in (ConfidenceLevel.LOW, ConfidenceLevel.UNSURE):
             return True
             
         # Require review for high-value billing codes
-        if any(code.fee_euros and code.fee_euros > 100 for code in billing_codes):
+        if max_fee > 100:
             return True
             
         # Require review if no billing codes found but procedures mentioned
-        procedures = values.get('procedures_performed', [])
-        if procedures and not billing_codes:
+        if self.procedures_performed and not self.billing_codes:
             return True
             
         return False
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "recording_id": "rec_2024_07_20_001",
-                "patient_id": "evident_12345",
-                "dentist_id": "dr_mueller",
-                "treatment_type": "filling",
-                "findings": [
-                    {
-                        "tooth_number": "36",
-                        "surface": "okklusal",
-                        "diagnosis": "Karies profunda",
-                        "confidence": "high"
-                    }
-                ],
-                "procedures_performed": ["Lokalanästhesie", "Kompositfüllung"],
-                "billing_codes": [
-                    {
-                        "code": "GOZ 2080",
-                        "system": "goz",
-                        "description": "Füllung einflächig",
-                        "fee_euros": 26.40,
-                        "confidence": "high"
-                    },
-                    {
-                        "code": "BEMA L1",
-                        "system": "bema",
-                        "description": "Leitungsanästhesie",
-                        "fee_euros": 10.72,
-                        "confidence": "high"
-                    },
-                    {
-                        "code": "GOZ 0090",
-                        "system": "goz",
-                        "description": "Leitungsanästhesie",
-                        "fee_euros": 12.00,
-                        "confidence": "high"
-                    },
-                    {
-                        "code": "BEMA bmf",
-                        "system": "bema",
-                        "description": "Stillung einer Papillenblutung, Zähne separiert",
-                        "fee_euros": 6.00,
-                        "confidence": "medium"
-                    }
-                ],
-                "clinical_notes": "Zahn 36 okklusal: Karies profunda entfernt, Kompositfüllung gelegt",
-                "overall_confidence": "high",
-                "requires_review": False
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_schema_example)
 
 
 # Response schemas for API endpoints
@@ -305,14 +225,7 @@ class DocumentationCreateRequest(BaseModel):
     treatment_context: Optional[str] = Field(None, description="Treatment context/notes")
     # Audio file will be uploaded separately
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "patient_id": "evident_12345",
-                "dentist_id": "dr_mueller",
-                "treatment_context": "Routine checkup and cleaning"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_schema_example)
 
 
 class DocumentationResponse(BaseModel):
@@ -323,15 +236,4 @@ class DocumentationResponse(BaseModel):
     error_message: Optional[str] = Field(None, description="Error message if failed")
     processing_time_ms: int = Field(..., description="Total processing time")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "documentation": {
-                    "recording_id": "rec_2024_07_20_001",
-                    "overall_confidence": "high",
-                    "requires_review": False
-                },
-                "processing_time_ms": 5420
-            }
-        } 
\ No newline at end of file
+    model_config = ConfigDict(json_schema_extra=_schema_example)
\ No newline at end of file
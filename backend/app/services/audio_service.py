@@ -3,16 +3,36 @@ Audio Processing Service
 Handles speech-to-text conversion using OpenAI Whisper and other STT engines
 """
 
+import asyncio
+import functools
+import mimetypes
 import os
-import tempfile
+import re
+import threading
 import time
-from typing import Optional, Dict, Any, BinaryIO
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from statistics import fmean
+from typing import TYPE_CHECKING, AsyncIterator, Final, Optional, Dict, Any, BinaryIO, Union
 import structlog
 
 from app.core.config import settings
 from app.schemas.dental_documentation import TranscriptionResult, AudioMetadata
-from app.utils.audio import AudioProcessor, AudioValidationError
+from app.services.inference_batcher import InferenceBatcher
+from app.utils.audio import AudioProcessor, AudioValidationError, decode_pcm16, map_upload, read_header
+
+try:
+    import httpx
+    import openai
+except ImportError:  # Only needed for the OpenAI Whisper API backend
+    openai = None
+
+try:
+    from prometheus_client import Histogram
+except ImportError:  # Metrics are optional
+    Histogram = None
+
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = structlog.get_logger()
 
@@ -22,6 +42,151 @@ class AudioTranscriptionError(Exception):
     pass
 
 
+# Blocking Whisper inference runs on a dedicated pool so the event loop keeps
+# serving other requests; the semaphore queues callers fairly for a free slot
+_INFER_SEM = asyncio.Semaphore(settings.INFER_CONCURRENCY)
+_INFER_POOL = ThreadPoolExecutor(
+    max_workers=settings.INFER_CONCURRENCY,
+    thread_name_prefix="whisper-inference"
+)
+
+
+async def run_inference(func, *args, **kwargs):
+    """Run a blocking inference call on the inference pool, bounded by the slot semaphore"""
+    async with _INFER_SEM:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_INFER_POOL, functools.partial(func, *args, **kwargs))
+
+
+# Per-backend transcription latency, exported on /metrics when prometheus_client is installed
+TRANSCRIBE_LATENCY = Histogram(
+    "whisper_transcribe_ms",
+    "Whisper transcription latency in milliseconds",
+    ["backend"],
+    buckets=(50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+) if Histogram is not None else None
+
+
+def observe_latency(backend: str, processing_time_ms: int):
+    """Record a transcription latency sample"""
+    if TRANSCRIBE_LATENCY is not None:
+        TRANSCRIBE_LATENCY.labels(backend=backend).observe(processing_time_ms)
+
+
+# German dental terminology passed as the Whisper API prompt to improve
+# recognition of terms and procedures
+DENTAL_TERMINOLOGY_PROMPT: Final[str] = (
+    "Dies ist eine Aufnahme aus einer deutschen Zahnarztpraxis. "
+    "Häufige Begriffe: Karies, Parodontitis, Zahnextraktion, Füllungstherapie, "
+    "Lokalanästhesie, Leitungsanästhesie, Röntgenbild, Zahn, okklusal, "
+    "mesial, distal, vestibulär, lingual, Komposit, Amalgam, Krone, "
+    "Brücke, Implantat, Wurzelkanalbehandlung, Gingivitis, Prophylaxe, "
+    "BEMA, GOZ, Ziffer, Abrechnung."
+)
+
+
+# Subtitle credits and sign-offs Whisper learned from its training data and
+# emits over silence or trailing noise
+HALLUCINATED_PHRASES = re.compile(
+    r"\b(?:"
+    r"untertitel(?:ung)? (?:im auftrag )?(?:des|der|von) (?:[^.!?\n]|\.(?=\w))*"
+    r"|vielen dank f(?:ü|ue)r(?:s|'s)? zu(?:schauen|hören)"
+    r"|danke f(?:ü|ue)r(?:s|'s)? zu(?:schauen|hören)"
+    r"|copyright (?:wdr|swr|zdf|ard) \d{4}"
+    r"|thanks? (?:you )?for watching"
+    r")[.!]?",
+    re.IGNORECASE
+)
+MAX_LOOP_NGRAM = 4  # Phrase length checked for decoding loops, in words
+MAX_LOOP_REPEATS = 3  # Back-to-back repeats allowed before a loop is collapsed
+
+# Dictated measurements (probing depths, mobility grades) legitimately repeat,
+# so phrases made only of numbers are never treated as a loop
+NUMBER_WORDS = frozenset((
+    "null", "eins", "ein", "zwei", "drei", "vier", "fünf",
+    "sechs", "sieben", "acht", "neun", "zehn", "elf", "zwölf",
+))
+
+
+def _is_number_token(key: str) -> bool:
+    return key.isdigit() or key in NUMBER_WORDS
+
+
+def collapse_repeated_ngrams(text: str, n: int = MAX_LOOP_NGRAM, max_repeat: int = MAX_LOOP_REPEATS) -> str:
+    """
+    Collapse Whisper decoding loops ("Zahn 36 Zahn 36 Zahn 36 ...") to one copy
+    
+    Only phrases of exactly n words are checked: one repeated back to back
+    more than max_repeat times is kept once. Shorter repeats ("nein nein
+    nein nein") and runs of numbers ("3 3 3 3 2 2") are real dictation and
+    are left untouched.
+    """
+    words = text.split()
+    keys = [word.lower().strip(".,!?;:") for word in words]
+    kept = []
+    index = 0
+    collapsed = False
+    
+    while index < len(words):
+        gram = keys[index:index + n]
+        repeats = 1
+        if len(gram) == n and not all(_is_number_token(key) for key in gram):
+            while keys[index + repeats * n:index + (repeats + 1) * n] == gram:
+                repeats += 1
+        
+        if repeats > max_repeat:
+            kept.extend(words[index:index + n])
+            index += repeats * n
+            collapsed = True
+        else:
+            kept.append(words[index])
+            index += 1
+    
+    return " ".join(kept) if collapsed else text
+
+
+def clean_transcript(text: str) -> str:
+    """Strip hallucinated boilerplate and decoding loops so one Whisper pass is final"""
+    cleaned = " ".join(collapse_repeated_ngrams(HALLUCINATED_PHRASES.sub(" ", text)).split())
+    if cleaned == " ".join(text.split()):
+        return text
+    
+    logger.info("Removed hallucinated transcript text", removed_chars=len(text) - len(cleaned))
+    return cleaned
+
+
+def build_local_result(
+    text: str,
+    language: str,
+    segments: list[dict],
+    processing_time: int,
+    stt_model: str
+) -> TranscriptionResult:
+    """Build a TranscriptionResult from locally decoded text and segments"""
+    text = clean_transcript(text)
+    
+    # Calculate overall confidence
+    confidence = 0.85  # Default for local Whisper
+    if segments:
+        avg_logprob = fmean(seg["confidence"] for seg in segments)
+        confidence = min(1.0, max(0.0, (avg_logprob + 1.0)))
+    
+    logger.info("Local Whisper transcription completed",
+               text_length=len(text),
+               confidence=confidence,
+               processing_time_ms=processing_time,
+               stt_model=stt_model)
+    
+    return TranscriptionResult(
+        text=text,
+        language=language,
+        confidence=confidence,
+        segments=segments,
+        processing_time_ms=processing_time,
+        stt_model=stt_model
+    )
+
+
 class OpenAIWhisperService:
     """OpenAI Whisper API integration"""
     
@@ -30,57 +195,69 @@ class OpenAIWhisperService:
         self.model = settings.OPENAI_MODEL
         self.max_file_size = settings.MAX_AUDIO_SIZE_MB * 1024 * 1024
         
-    async def transcribe(self, audio_file: BinaryIO, filename: str) -> TranscriptionResult:
+        # Dental terminology prompt for better accuracy, resolved once
+        self._dental_prompt = DENTAL_TERMINOLOGY_PROMPT if settings.DENTAL_TERMINOLOGY_BOOST else None
+        
+        # One async client (and keep-alive connection pool) shared by all requests
+        self._client = openai.AsyncOpenAI(
+            api_key=self.api_key,
+            max_retries=2,
+            timeout=settings.OPENAI_TIMEOUT_SECONDS,
+            http_client=httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=20))
+        ) if openai is not None and self.api_key else None
+        
+    async def transcribe(self, audio_file: BinaryIO, filename: str, need_segments: bool = True) -> TranscriptionResult:
         """
         Transcribe audio using OpenAI Whisper API
         
         Args:
             audio_file: Audio file binary data
             filename: Original filename for format detection
+            need_segments: Request timed segments (verbose_json); plain json
+                returns only the text, which is smaller and faster to parse
             
         Returns:
             TranscriptionResult with transcribed text and metadata
         """
         if not self.api_key:
             raise AudioTranscriptionError("OpenAI API key not configured")
+        if self._client is None:
+            raise AudioTranscriptionError("OpenAI library not installed. Run: pip install openai")
         
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         try:
-            # Import OpenAI here to avoid dependency issues if not installed
-            import openai
-            
-            # Configure OpenAI client
-            client = openai.OpenAI(api_key=self.api_key)
-            
             logger.info("Starting OpenAI Whisper transcription", filename=filename)
             
-            # Prepare dental terminology prompt for better accuracy
-            dental_prompt = self._get_dental_terminology_prompt() if settings.DENTAL_TERMINOLOGY_BOOST else None
-            
             # Call Whisper API with enhanced settings
-            response = client.audio.transcriptions.create(
+            response = await self._client.audio.transcriptions.create(
                 model=self.model,
-                file=(filename, audio_file, "audio/wav"),
+                file=(filename, audio_file, mimetypes.guess_type(filename)[0] or "application/octet-stream"),
                 language="de",  # German language
-                response_format="verbose_json",  # Get confidence scores
+                response_format="verbose_json" if need_segments else "json",  # Segments carry confidence scores
                 temperature=settings.WHISPER_TEMPERATURE,  # Enhanced temperature setting
-                prompt=dental_prompt  # Dental context for better recognition
+                prompt=self._dental_prompt  # Dental context for better recognition
             )
             
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = (time.perf_counter_ns() - start_time) // 1_000_000
+            observe_latency("openai", processing_time)
             
             # Extract result
-            transcribed_text = response.text
+            transcribed_text = clean_transcript(response.text)
             
             # Get confidence from segments if available
             confidence = getattr(response, 'confidence', 0.9)  # Default confidence
-            segments = getattr(response, 'segments', None)
+            
+            # SDK segments are pydantic models; dump each once instead of per-field getattr
+            segments = [
+                seg.model_dump() if hasattr(seg, 'model_dump') else dict(seg)
+                for seg in (getattr(response, 'segments', None) or [])
+            ] or None
             
             # Calculate average confidence from segments if available
-            if segments and hasattr(segments[0], 'avg_logprob'):
+            if segments and 'avg_logprob' in segments[0]:
                 # Convert log probability to confidence (approximate)
-                avg_logprob = sum(seg.avg_logprob for seg in segments) / len(segments)
+                avg_logprob = fmean(seg['avg_logprob'] for seg in segments)
                 confidence = min(1.0, max(0.0, (avg_logprob + 1.0)))  # Normalize to 0-1
             
             logger.info("OpenAI Whisper transcription completed",
@@ -97,48 +274,125 @@ class OpenAIWhisperService:
                 stt_model=f"openai-{self.model}"
             )
             
-        except ImportError:
-            raise AudioTranscriptionError("OpenAI library not installed. Run: pip install openai")
         except Exception as e:
             logger.error("OpenAI Whisper transcription failed", error=str(e))
             raise AudioTranscriptionError(f"Whisper API error: {str(e)}")
     
-    def _get_dental_terminology_prompt(self) -> str:
-        """
-        Generate a dental terminology prompt to improve Whisper's recognition
-        of German dental terms and procedures
-        """
-        return """Dies ist eine Aufnahme aus einer deutschen Zahnarztpraxis. 
-        Häufige Begriffe: Karies, Parodontitis, Zahnextraktion, Füllungstherapie, 
-        Lokalanästhesie, Leitungsanästhesie, Röntgenbild, Zahn, okklusal, 
-        mesial, distal, vestibulär, lingual, Komposit, Amalgam, Krone, 
-        Brücke, Implantat, Wurzelkanalbehandlung, Gingivitis, Prophylaxe,
-        BEMA, GOZ, Ziffer, Abrechnung."""
+class AudioStagingBuffers:
+    """
+    Page-locked host buffers for uploading padded audio batches to the GPU.
+    
+    Buffers are reused round-robin (one more than the number of batches in
+    flight) and copies run on a dedicated CUDA stream, so uploading the next
+    batch overlaps with decoding of the current one.
+    """
+    
+    def __init__(self, device, rows: int, samples: int, count: int = 2):
+        import torch
+        
+        self.device = device
+        self.rows = rows
+        self.stream = torch.cuda.Stream(device=device)
+        self._buffers = [
+            (torch.empty((rows, samples), dtype=torch.int16, pin_memory=True), torch.cuda.Event())
+            for _ in range(count)
+        ]
+        self._next = 0
+        self._lock = threading.Lock()
+    
+    def upload(self, clips: list):
+        """Copy clips into the next free buffer and start the H2D copy; returns (tensor, ready_event)"""
+        import torch
+        
+        with self._lock:
+            buffer, copied = self._buffers[self._next]
+            self._next = (self._next + 1) % len(self._buffers)
+            
+            # The previous copy out of this buffer must finish before refilling it
+            copied.synchronize()
+            
+            staging = buffer[:len(clips)]
+            for row, clip in zip(staging.numpy(), clips):
+                row[:len(clip)] = clip
+                row[len(clip):] = 0
+            
+            with torch.cuda.stream(self.stream):
+                batch = staging.to(self.device, non_blocking=True)
+                copied.record(self.stream)
+            
+            return batch, copied
 
 
 class LocalWhisperService:
     """Local Whisper model (fallback when OpenAI API not available)"""
     
+    INITIAL_PROMPT: Final[str] = "Deutsche Zahnarztpraxis: Karies, Zahn, Lokalanästhesie, Füllung, Röntgenbild"
+    
     def __init__(self):
         self.model_size = settings.WHISPER_MODEL_SIZE
         self.device = settings.WHISPER_DEVICE
         self._model = None
+        self._model_lock = threading.Lock()
+        self._prompt_tokens = None
+        self._hann_window = None
+        self._mel_filters = None
+        self._staging = None
+        
+        # Concurrent requests are coalesced into one batched forward pass
+        self._batcher = InferenceBatcher(
+            self._transcribe_batch,
+            max_batch_size=settings.BATCH_MAX_SIZE,
+            window_ms=settings.BATCH_WINDOW_MS,
+            duration_bin_seconds=settings.BATCH_DURATION_BIN_SECONDS,
+            max_in_flight=settings.INFER_CONCURRENCY
+        )
         
     def _load_model(self):
         """Lazy load Whisper model"""
-        if self._model is None:
+        with self._model_lock:
+            if self._model is not None:
+                return
+            
             try:
+                import torch
                 import whisper
                 
+                # Whisper's encoder always sees fixed 30s windows, so cuDNN's
+                # autotuned kernels stay valid; allow TF32 for fp32 matmuls
+                torch.backends.cudnn.benchmark = True
+                torch.set_float32_matmul_precision("high")
+                
                 logger.info("Loading local Whisper model", 
                            model_size=self.model_size,
                            device=self.device)
                 
                 self._model = whisper.load_model(
                     self.model_size, 
-                    device=self.device if self.device != "auto" else None
+                    device=self.device if self.device != "auto" else None,
+                    download_root=settings.WHISPER_MODEL_DIR
                 )
                 
+                # Tokenize the prompt once instead of on every batched decode
+                tokenizer = whisper.tokenizer.get_tokenizer(
+                    self._model.is_multilingual,
+                    num_languages=self._model.num_languages,
+                    language="de",
+                    task="transcribe"
+                )
+                self._prompt_tokens = tokenizer.encode(" " + self.INITIAL_PROMPT)
+                
+                # STFT window and mel filterbank live on the model device for the batched front end
+                self._hann_window = torch.hann_window(whisper.audio.N_FFT, device=self._model.device)
+                self._mel_filters = whisper.audio.mel_filters(self._model.device, self._model.dims.n_mels)
+                
+                if self._model.device.type == "cuda":
+                    self._staging = AudioStagingBuffers(
+                        self._model.device,
+                        rows=settings.BATCH_MAX_SIZE,
+                        samples=whisper.audio.N_SAMPLES,
+                        count=settings.INFER_CONCURRENCY + 1
+                    )
+                
                 logger.info("Local Whisper model loaded successfully")
                 
             except ImportError:
@@ -146,78 +400,447 @@ class LocalWhisperService:
             except Exception as e:
                 raise AudioTranscriptionError(f"Failed to load Whisper model: {str(e)}")
     
-    async def transcribe(self, audio_file_path: str) -> TranscriptionResult:
+    async def warmup(self):
+        """Load the model and decode one second of silence to initialise CUDA kernels"""
+        import numpy as np
+        
+        audios = [np.zeros(16000, dtype=np.int16)]
+        staged = await asyncio.to_thread(self._stage_short_clips, audios)
+        await run_inference(self._transcribe_batch_sync, audios, staged)
+    
+    async def transcribe(self, audio: Union[str, "np.ndarray"], duration_seconds: float = 0.0) -> TranscriptionResult:
         """
         Transcribe audio using local Whisper model
         
         Args:
-            audio_file_path: Path to audio file
+            audio: Path to audio file, or 16kHz mono int16 PCM samples
+            duration_seconds: Recording duration, used to batch similar-length clips
             
         Returns:
             TranscriptionResult with transcribed text and metadata
         """
+        logger.info("Starting local Whisper transcription",
+                   file_path=audio if isinstance(audio, str) else None)
+        return await self._batcher.submit(audio, duration_seconds)
+    
+    async def _transcribe_batch(self, items: list) -> list:
+        """
+        Decode, resample and upload on worker threads, then run one batch on the
+        inference pool; the upload overlaps with whatever batch holds the slot
+        """
+        decoded = await asyncio.gather(*(self._decode(item) for item in items), return_exceptions=True)
+        audios = [entry if isinstance(entry, Exception) else entry[0] for entry in decoded]
+        speech_maps = [None if isinstance(entry, Exception) else entry[1] for entry in decoded]
+        
+        try:
+            staged = await asyncio.to_thread(self._stage_short_clips, audios)
+        except AudioTranscriptionError as e:
+            return [e] * len(audios)
+        
+        return await run_inference(self._transcribe_batch_sync, audios, staged, speech_maps)
+    
+    def _stage_short_clips(self, audios: list) -> tuple[list[int], Any, Any]:
+        """
+        Pad clips that fit one 30s window into a batch tensor
+        
+        On CUDA the batch goes through pinned staging buffers and is copied on
+        a side stream; the returned event marks when the copy has landed.
+        
+        Returns:
+            Tuple of (indices of short clips, batch tensor, ready event or None)
+        """
         self._load_model()
+        import numpy as np
+        import torch
+        import whisper
+        
+        indices = [
+            index for index, audio in enumerate(audios)
+            if not isinstance(audio, Exception) and 0 < len(audio) <= whisper.audio.N_SAMPLES
+        ]
+        if not indices:
+            return indices, None, None
+        
+        clips = [audios[index] for index in indices]
+        if self._staging is not None and len(clips) <= self._staging.rows:
+            batch, ready = self._staging.upload(clips)
+            return indices, batch, ready
+        
+        batch = torch.from_numpy(np.stack([whisper.pad_or_trim(clip) for clip in clips]))
+        return indices, batch, None
+    
+    async def _decode(self, item: Union[str, "np.ndarray"]) -> tuple:
+        """Decode (file paths only) and cut silence off the event loop"""
+        return await asyncio.to_thread(self._load_speech, item)
+    
+    def _load_speech(self, item: Union[str, "np.ndarray"]) -> tuple:
+        """
+        Keep only the speech in a clip, using the Silero VAD bundled with faster-whisper
         
-        start_time = time.time()
+        Whisper spends a full encoder pass on silent windows and tends to
+        hallucinate text in them.
+        
+        Returns:
+            Tuple of (speech samples, SpeechTimestampsMap back to the original
+            timeline or None when nothing was cut)
+        """
+        audio = self._load_audio(item) if isinstance(item, str) else item
+        if not settings.WHISPER_VAD_FILTER or len(audio) == 0:
+            return audio, None
         
         try:
-            logger.info("Starting local Whisper transcription", file_path=audio_file_path)
-            
-            # Transcribe with Whisper (enhanced settings)
-            result = self._model.transcribe(
-                audio_file_path,
-                language="de",
-                word_timestamps=True,
-                temperature=settings.WHISPER_TEMPERATURE,
-                initial_prompt="Deutsche Zahnarztpraxis: Karies, Zahn, Lokalanästhesie, Füllung, Röntgenbild"
-            )
-            
-            processing_time = int((time.time() - start_time) * 1000)
+            import numpy as np
+            from faster_whisper.vad import SpeechTimestampsMap, get_speech_timestamps
+        except ImportError:
+            return audio, None
+        
+        spans = get_speech_timestamps(audio.astype(np.float32) / 32768.0, sampling_rate=16000)
+        if not spans:
+            return audio[:0], None
+        
+        speech = np.concatenate([audio[span["start"]:span["end"]] for span in spans])
+        return speech, SpeechTimestampsMap(spans, 16000)
+    
+    def _load_audio(self, audio_file_path: str):
+        """Decode an audio file to 16kHz mono int16 PCM (CPU only)"""
+        try:
+            return decode_pcm16(audio_file_path, sample_rate=16000)
+        except Exception as e:
+            logger.error("Failed to decode audio", file_path=audio_file_path, error=str(e))
+            raise AudioTranscriptionError(f"Local Whisper error: {str(e)}")
+    
+    def _transcribe_batch_sync(self, audios: list, staged: tuple, speech_maps: Optional[list] = None) -> list:
+        """
+        Transcribe a batch of decoded clips in as few forward passes as possible
+        
+        Clips that fit into a single 30s Whisper window are decoded together in
+        one batch; longer recordings go through transcribe()'s sliding window.
+        Log-mel features are computed on the model device in both cases.
+        Clips with silence cut out get their segment times mapped back through
+        speech_maps; clips without any speech come back as empty text.
+        
+        Returns:
+            One TranscriptionResult (or AudioTranscriptionError) per input clip
+        """
+        self._load_model()
+        import torch
+        import whisper
+        
+        start_time = time.perf_counter_ns()
+        results = [None] * len(audios)
+        short_indices, short_batch, short_ready = staged
+        
+        for index, audio in enumerate(audios):
+            if isinstance(audio, Exception):
+                results[index] = audio
+                continue
+            if index in short_indices:
+                continue
+            if len(audio) == 0:
+                results[index] = ("", "de", [])
+                continue
             
-            # Extract segments for detailed timing
-            segments = []
-            if "segments" in result:
+            try:
+                # Scaled to float on the device, so whisper runs STFT + mel there too
+                result = self._model.transcribe(
+                    torch.from_numpy(audio.copy()).to(self._model.device).float() / 32768.0,
+                    language="de",
+                    word_timestamps=True,
+                    temperature=settings.WHISPER_TEMPERATURE,
+                    initial_prompt=self.INITIAL_PROMPT,
+                    # Windows are stitched from cut speech; don't carry errors across them
+                    condition_on_previous_text=speech_maps is None or speech_maps[index] is None
+                )
                 segments = [
                     {
                         "start": seg["start"],
                         "end": seg["end"], 
                         "text": seg["text"],
-                        "confidence": getattr(seg, "avg_logprob", -0.5)
+                        "confidence": seg.get("avg_logprob", -0.5)
                     }
-                    for seg in result["segments"]
+                    for seg in result.get("segments", [])
                 ]
+                results[index] = (result["text"], result.get("language", "de"), segments)
+            except Exception as e:
+                logger.error("Local Whisper transcription failed", error=str(e))
+                results[index] = AudioTranscriptionError(f"Local Whisper error: {str(e)}")
+        
+        if short_indices:
+            try:
+                decoded = self._decode_batch(short_batch, short_ready)
+                for index, result in zip(short_indices, decoded):
+                    segments = [{
+                        "start": 0.0,
+                        "end": len(audios[index]) / whisper.audio.SAMPLE_RATE,
+                        "text": result.text,
+                        "confidence": result.avg_logprob
+                    }]
+                    results[index] = (result.text, result.language or "de", segments)
+            except Exception as e:
+                logger.error("Local Whisper batch decoding failed", batch_size=len(short_indices), error=str(e))
+                for index in short_indices:
+                    results[index] = AudioTranscriptionError(f"Local Whisper error: {str(e)}")
+        
+        # Segment times refer to the speech-only clip; restore the recording's timeline
+        for index, speech_map in enumerate(speech_maps or ()):
+            if speech_map is not None and isinstance(results[index], tuple):
+                for seg in results[index][2]:
+                    seg["start"] = speech_map.get_original_time(seg["start"])
+                    seg["end"] = speech_map.get_original_time(seg["end"])
+        
+        processing_time = (time.perf_counter_ns() - start_time) // 1_000_000
+        for _ in audios:
+            observe_latency("openai-whisper", processing_time)
+        
+        logger.info("Local Whisper batch completed",
+                   batch_size=len(audios),
+                   processing_time_ms=processing_time)
+        
+        return [
+            result if isinstance(result, Exception)
+            else build_local_result(*result, processing_time, f"whisper-{self.model_size}")
+            for result in results
+        ]
+    
+    def _decode_batch(self, batch, ready=None) -> list:
+        """Decode a padded batch of up-to-30s clips in a single batched Whisper forward"""
+        import whisper
+        
+        mels = self._log_mel_batch(batch, ready)
+        
+        options = whisper.DecodingOptions(
+            language="de",
+            temperature=settings.WHISPER_TEMPERATURE,
+            prompt=self._prompt_tokens,
+            fp16=self._model.device.type == "cuda"
+        )
+        return whisper.decode(self._model, mels, options)
+    
+    def _log_mel_batch(self, batch, ready=None):
+        """Batched log-mel spectrogram with STFT + mel projection on the model device"""
+        import torch
+        import whisper
+        
+        device = self._model.device
+        if ready is not None:
+            # Batch was uploaded on the staging stream; order the compute stream after it
+            stream = torch.cuda.current_stream(device)
+            stream.wait_event(ready)
+            batch.record_stream(stream)
+        
+        # PCM is uploaded as int16 (half the bytes) and scaled on the device
+        batch = batch.to(device).float() / 32768.0
+        
+        stft = torch.stft(
+            batch,
+            whisper.audio.N_FFT,
+            whisper.audio.HOP_LENGTH,
+            window=self._hann_window,
+            return_complex=True
+        )
+        magnitudes = stft[..., :-1].abs() ** 2
+        
+        log_spec = torch.clamp(self._mel_filters @ magnitudes, min=1e-10).log10()
+        
+        # Dynamic range is clamped per clip, as whisper.log_mel_spectrogram does
+        log_spec = torch.maximum(log_spec, log_spec.amax(dim=(1, 2), keepdim=True) - 8.0)
+        return (log_spec + 4.0) / 4.0
+
+
+class FasterWhisperService:
+    """Local Whisper on CTranslate2 (faster-whisper) with int8 weights"""
+    
+    def __init__(self):
+        self.model_size = settings.WHISPER_MODEL_SIZE
+        self.device = settings.WHISPER_DEVICE
+        self.compute_type = settings.WHISPER_COMPUTE_TYPE
+        self._model = None
+        self._pipeline = None
+        self._replicas = 1
+        self._model_lock = threading.Lock()
+    
+    def _load_model(self):
+        """Lazy load faster-whisper model"""
+        with self._model_lock:
+            if self._model is not None:
+                return
             
-            # Calculate overall confidence
-            confidence = 0.85  # Default for local Whisper
-            if segments:
-                avg_logprob = sum(seg.get("confidence", -0.5) for seg in segments) / len(segments)
-                confidence = min(1.0, max(0.0, (avg_logprob + 1.0)))
-            
-            transcribed_text = result["text"]
-            
-            logger.info("Local Whisper transcription completed",
-                       text_length=len(transcribed_text),
-                       confidence=confidence,
-                       processing_time_ms=processing_time)
+            try:
+                import ctranslate2
+                from faster_whisper import BatchedInferencePipeline, WhisperModel
+                
+                gpu_count = ctranslate2.get_cuda_device_count()
+                device = self.device
+                if device == "auto":
+                    device = "cuda" if gpu_count > 0 else "cpu"
+                
+                # float16 activations need a GPU; CPU runs pure int8. Older GPUs
+                # lack some types (e.g. int8_float16 before compute capability 7.0)
+                compute_type = self.compute_type
+                if device == "cpu" and "float16" in compute_type:
+                    compute_type = "int8"
+                supported = ctranslate2.get_supported_compute_types(device)
+                if compute_type not in supported:
+                    fallback = next(
+                        (ct for ct in ("int8_float16", "float16", "int8_float32", "int8") if ct in supported),
+                        "default"
+                    )
+                    logger.warning("Compute type not supported on this device, falling back",
+                                  compute_type=compute_type,
+                                  fallback=fallback,
+                                  device=device)
+                    compute_type = fallback
+                
+                # One replica per visible GPU; CTranslate2 hands each call to an
+                # idle replica, and num_workers counts replicas per device
+                device_index = list(range(gpu_count)) if device == "cuda" and gpu_count > 1 else [0]
+                devices = len(device_index)
+                if settings.INFER_CONCURRENCY < devices:
+                    logger.warning("INFER_CONCURRENCY is below the GPU count; some GPUs will idle",
+                                  infer_concurrency=settings.INFER_CONCURRENCY,
+                                  gpu_count=devices)
+                
+                logger.info("Loading faster-whisper model",
+                           model_size=self.model_size,
+                           device=device,
+                           device_index=device_index,
+                           compute_type=compute_type)
+                
+                num_workers = max(1, settings.INFER_CONCURRENCY // devices)
+                self._replicas = devices * num_workers
+                
+                self._model = WhisperModel(
+                    self.model_size,
+                    device=device,
+                    device_index=device_index,
+                    compute_type=compute_type,
+                    num_workers=num_workers,
+                    cpu_threads=max(1, (os.cpu_count() or 2) // 2) if device == "cpu" else 0,
+                    download_root=settings.WHISPER_MODEL_DIR,
+                    local_files_only=settings.WHISPER_LOCAL_FILES_ONLY
+                )
+                
+                # Decodes a recording's VAD chunks as one batch instead of
+                # sequentially, window after window
+                self._pipeline = BatchedInferencePipeline(model=self._model)
+                
+                logger.info("faster-whisper model loaded successfully")
+                
+            except ImportError:
+                raise AudioTranscriptionError("faster-whisper not installed. Run: pip install faster-whisper")
+            except Exception as e:
+                raise AudioTranscriptionError(f"Failed to load Whisper model: {str(e)}")
+    
+    async def warmup(self):
+        """Load the model and decode silence on every replica to initialise CUDA kernels"""
+        await run_inference(self._load_model)
+        # Concurrent calls go to idle replicas, so each GPU worker runs its
+        # first (allocator and kernel setup) pass here rather than on a request.
+        # The inference slots can be fewer than the replicas (one per GPU even
+        # when INFER_CONCURRENCY is lower), so warmup gets its own threads
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=self._replicas, thread_name_prefix="whisper-warmup") as pool:
+            await asyncio.gather(*(loop.run_in_executor(pool, self._warmup_sync) for _ in range(self._replicas)))
+    
+    def _warmup_sync(self):
+        import numpy as np
+        
+        # Unbatched and without VAD, so the silent clip still reaches the decoder
+        segments, _ = self._model.transcribe(
+            np.zeros(3 * 16000, dtype=np.float32),
+            language="de",
+            beam_size=settings.WHISPER_BEAM_SIZE
+        )
+        list(segments)
+    
+    async def transcribe(self, audio: Union[str, "np.ndarray"], duration_seconds: float = 0.0) -> TranscriptionResult:
+        """
+        Transcribe audio using faster-whisper
+        
+        Args:
+            audio: Path to audio file, or 16kHz mono int16 PCM samples
+            duration_seconds: Recording duration (unused, kept for interface parity)
             
-            return TranscriptionResult(
-                text=transcribed_text,
-                language=result.get("language", "de"),
-                confidence=confidence,
-                segments=segments,
-                processing_time_ms=processing_time,
-                stt_model=f"whisper-{self.model_size}"
-            )
+        Returns:
+            TranscriptionResult with transcribed text and metadata
+        """
+        logger.info("Starting local Whisper transcription",
+                   file_path=audio if isinstance(audio, str) else None)
+        
+        start_time = time.perf_counter_ns()
+        segments = [segment async for segment in self.transcribe_stream(audio)]
+        
+        processing_time = (time.perf_counter_ns() - start_time) // 1_000_000
+        observe_latency("faster-whisper", processing_time)
+        
+        # Loops spanning segment boundaries are caught when the joined text is cleaned
+        return build_local_result(
+            " ".join(segment["text"].strip() for segment in segments),
+            "de",
+            segments,
+            processing_time,
+            f"faster-whisper-{self.model_size}"
+        )
+    
+    async def transcribe_stream(self, audio: Union[str, "np.ndarray"]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield cleaned segments as faster-whisper decodes them
+        
+        For callers that show partial text instead of waiting for the whole
+        recording. Each step pulls one segment from the lazy generator on the
+        inference pool; hallucinated boilerplate and decoding loops are removed
+        per segment, and segments left empty are skipped.
+        
+        Args:
+            audio: Path to audio file, or 16kHz mono int16 PCM samples
             
+        Yields:
+            Segment dicts shaped like TranscriptionResult.segments entries
+        """
+        await run_inference(self._load_model)
+        
+        try:
+            segments_iter, _ = await run_inference(self._start_transcription, audio)
+            while (seg := await run_inference(next, segments_iter, None)) is not None:
+                segment = self._segment_dict(seg)
+                segment["text"] = clean_transcript(segment["text"])
+                if segment["text"].strip():
+                    yield segment
         except Exception as e:
             logger.error("Local Whisper transcription failed", error=str(e))
             raise AudioTranscriptionError(f"Local Whisper error: {str(e)}")
+    
+    def _start_transcription(self, audio: Union[str, "np.ndarray"]) -> tuple:
+        """Start a batched transcription; segments are decoded lazily while iterating"""
+        if not isinstance(audio, str):
+            # faster-whisper takes float32 samples in [-1, 1]
+            audio = audio.astype("float32") / 32768.0
+        
+        return self._pipeline.transcribe(
+            audio,
+            language="de",
+            batch_size=settings.BATCH_MAX_SIZE,
+            beam_size=settings.WHISPER_BEAM_SIZE,
+            # Skip silence between utterances; speech chunks form the batch
+            vad_filter=True,
+            temperature=settings.WHISPER_TEMPERATURE,
+            initial_prompt=LocalWhisperService.INITIAL_PROMPT
+        )
+    
+    @staticmethod
+    def _segment_dict(seg) -> Dict[str, Any]:
+        return {
+            "start": seg.start,
+            "end": seg.end,
+            "text": seg.text,
+            "confidence": seg.avg_logprob
+        }
 
 
 class MockTranscriptionService:
     """Mock service for testing without actual STT"""
     
-    async def transcribe(self, audio_file: BinaryIO, filename: str) -> TranscriptionResult:
+    async def transcribe(self, audio_file: BinaryIO, filename: str, need_segments: bool = True) -> TranscriptionResult:
         """Mock transcription for testing"""
         
         # Simulate processing time
@@ -243,14 +866,34 @@ class AudioService:
         
         # Initialize available transcription services
         self.openai_service = OpenAIWhisperService() if settings.OPENAI_API_KEY else None
-        self.local_service = LocalWhisperService()
+        self.local_service = (
+            FasterWhisperService() if settings.WHISPER_BACKEND == "faster-whisper"
+            else LocalWhisperService()
+        )
         self.mock_service = MockTranscriptionService()
         
+    async def warmup(self):
+        """Preload the local Whisper model when it is the transcription backend"""
+        if self.openai_service is not None:
+            return
+        
+        start_time = time.perf_counter_ns()
+        try:
+            await self.local_service.warmup()
+        except Exception as e:
+            # Not fatal: transcribe() loads the model lazily and reports the error per request
+            logger.warning("Local Whisper warmup failed", error=str(e))
+            return
+        
+        logger.info("Local Whisper model warmed up",
+                   load_time_ms=(time.perf_counter_ns() - start_time) // 1_000_000)
+    
     async def process_audio(
         self, 
         audio_file: BinaryIO, 
         filename: str,
-        use_mock: bool = False
+        use_mock: bool = False,
+        need_segments: bool = True
     ) -> tuple[TranscriptionResult, AudioMetadata]:
         """
         Process audio file: validate, convert, and transcribe
@@ -259,6 +902,8 @@ class AudioService:
             audio_file: Audio file binary data
             filename: Original filename
             use_mock: Use mock service for testing
+            need_segments: Whether to return timed segments; the API services
+                then skip requesting them
             
         Returns:
             Tuple of (TranscriptionResult, AudioMetadata)
@@ -266,33 +911,43 @@ class AudioService:
         logger.info("Starting audio processing", filename=filename, use_mock=use_mock)
         
         try:
-            # Read audio data
-            audio_data = audio_file.read()
-            audio_file.seek(0)  # Reset for potential reuse
-            
-            # Validate audio file
-            audio_metadata = self.audio_processor.validate_audio(audio_data, filename)
-            
             # Choose transcription service
             if use_mock:
                 transcription_service = self.mock_service
-                logger.info("Using mock transcription service")
             elif self.openai_service:
                 transcription_service = self.openai_service
-                logger.info("Using OpenAI Whisper API")
             else:
                 transcription_service = self.local_service
-                logger.info("Using local Whisper model")
             
-            # For local Whisper, we need to save to temp file
             if transcription_service == self.local_service:
-                transcription_result = await self._transcribe_with_local(audio_data, filename)
+                # Map audio data (zero-copy for uploads spooled to disk)
+                with map_upload(audio_file) as audio_data:
+                    # Validate audio file
+                    audio_metadata = self.audio_processor.validate_audio(audio_data, filename)
+                    
+                    # Local Whisper gets decoded PCM samples, no temp file or re-read
+                    audio = await asyncio.to_thread(decode_pcm16, audio_data, 16000)
+                
+                # The decode yields the exact duration compressed formats only estimate
+                if audio_metadata.format != "wav":
+                    audio_metadata.duration_seconds = len(audio) / 16000
+                
+                transcription_result = await self.local_service.transcribe(
+                    audio, audio_metadata.duration_seconds
+                )
+                if not need_segments:
+                    transcription_result.segments = None
             else:
-                # API services can handle file objects directly
-                transcription_result = await transcription_service.transcribe(audio_file, filename)
+                # Validate from the header alone; API services stream the file object
+                header, size_bytes = read_header(audio_file)
+                audio_metadata = self.audio_processor.validate_audio(header, filename, size_bytes)
+                transcription_result = await transcription_service.transcribe(
+                    audio_file, filename, need_segments=need_segments
+                )
             
             logger.info("Audio processing completed successfully",
                        filename=filename,
+                       stt_service=type(transcription_service).__name__,
                        text_length=len(transcription_result.text),
                        confidence=transcription_result.confidence)
             
@@ -305,34 +960,10 @@ class AudioService:
             logger.error("Audio processing failed", filename=filename, error=str(e))
             raise AudioTranscriptionError(f"Audio processing error: {str(e)}")
     
-    async def _transcribe_with_local(self, audio_data: bytes, filename: str) -> TranscriptionResult:
-        """Transcribe using local Whisper with temporary file"""
-        
-        # Create temporary file
-        suffix = Path(filename).suffix or ".wav"
-        
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_file:
-            temp_file.write(audio_data)
-            temp_path = temp_file.name
-        
-        try:
-            # Transcribe with local service
-            return await self.local_service.transcribe(temp_path)
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(temp_path)
-            except OSError:
-                logger.warning("Failed to delete temporary file", path=temp_path)
-    
-    def get_supported_formats(self) -> list[str]:
-        """Get list of supported audio formats"""
+    def get_supported_formats(self) -> tuple[str, ...]:
+        """Get supported audio formats"""
         return settings.supported_audio_formats_list
     
     def get_max_file_size(self) -> int:
         """Get maximum allowed file size in bytes"""
-        return settings.MAX_AUDIO_SIZE_MB * 1024 * 1024
-
-
-# Add missing import for asyncio
-import asyncio 
\ No newline at end of file
+        return settings.MAX_AUDIO_SIZE_MB * 1024 * 1024 
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+Medical Code Catalog Loader
+Seeds the medical_codes table from the bundled BEMA/GOZ catalog
+"""
+
+import asyncio
+from functools import cache
+from pathlib import Path
+from typing import Dict, List
+import orjson
+import structlog
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.medical_code import CodeSystem, MedicalCode
+
+logger = structlog.get_logger(__name__)
+
+CATALOG_FILE = Path(__file__).parent.parent.parent / "data" / "bema_goz_codes.json"
+
+# Dialect-specific INSERT constructs that support ON CONFLICT DO NOTHING
+DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+@cache
+def load_catalog(catalog_file: Path = CATALOG_FILE) -> Dict:
+    """
+    Parse the BEMA/GOZ catalog once per process
+    
+    The parsed dict is shared by every caller and must be treated as read-only.
+    Raises FileNotFoundError if the catalog is missing (not cached).
+    """
+    return orjson.loads(catalog_file.read_bytes())
+
+
+def catalog_rows(catalog: Dict) -> List[Dict]:
+    """Flatten the BEMA/GOZ catalog into medical_codes row dicts"""
+    meta = catalog.get("meta", {})
+    rows = []
+
+    for code, info in catalog.get("bema_codes", {}).items():
+        rows.append({
+            "code": code,
+            "system": CodeSystem.BEMA,
+            "name": info["description"][:200],
+            "base_points": info.get("points"),
+            "base_fee": round(info.get("points", 0) * meta.get("bema_point_value", 1.0), 2),
+            "category": info.get("category"),
+            "search_terms": ", ".join(info.get("keywords", [])),
+            "is_active": True,
+        })
+
+    for code, info in catalog.get("goz_codes", {}).items():
+        rows.append({
+            "code": code,
+            "system": CodeSystem.GOZ,
+            "name": info["description"][:200],
+            "base_points": info.get("points"),
+            "base_fee": round(
+                info.get("points", 0) * meta.get("goz_point_value", 0.0582) * info.get("standard_factor", 2.3), 2
+            ),
+            "category": info.get("category"),
+            "search_terms": ", ".join(info.get("keywords", [])),
+            "is_active": True,
+        })
+
+    return rows
+
+
+async def load_medical_codes(db: AsyncSession, catalog_file: Path = CATALOG_FILE) -> int:
+    """
+    Bulk insert the catalog through one Core executemany.
+
+    Skips the per-instance ORM bookkeeping of add_all(); codes already present
+    (same system and code) are left untouched, so re-running is safe. On
+    PostgreSQL autovacuum is paused on the table for the duration of the load.
+    """
+    rows = catalog_rows(load_catalog(catalog_file))
+    if not rows:
+        return 0
+
+    dialect = db.get_bind().dialect.name
+    insert = DIALECT_INSERTS.get(dialect)
+    if insert is None:
+        raise ValueError(f"Unsupported database dialect for catalog load: {dialect}")
+
+    statement = insert(MedicalCode.__table__).on_conflict_do_nothing(index_elements=["system", "code"])
+
+    # ALTER TABLE is transactional in PostgreSQL, so a failed load rolls the
+    # autovacuum setting back together with the rows
+    if dialect == "postgresql":
+        await db.execute(text("ALTER TABLE medical_codes SET (autovacuum_enabled = off)"))
+    await db.execute(statement, rows)
+    if dialect == "postgresql":
+        await db.execute(text("ALTER TABLE medical_codes RESET (autovacuum_enabled)"))
+    await db.commit()
+
+    logger.info("Medical code catalog loaded", rows=len(rows), dialect=dialect)
+    return len(rows)
+
+
+async def main():
+    from app.core.database import SessionLocal
+
+    async with SessionLocal() as db:
+        await load_medical_codes(db)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
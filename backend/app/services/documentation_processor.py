@@ -4,10 +4,12 @@ Converts transcribed speech into structured dental documentation using AI/LLM
 """
 
 import re
-import json
 import uuid
-from typing import List, Dict, Optional, Tuple
+from collections import defaultdict
+from functools import lru_cache
+from typing import List, Dict, NamedTuple, Optional, Tuple
 from datetime import datetime
+from types import MappingProxyType
 import structlog
 import time
 
@@ -18,17 +20,47 @@ from app.schemas.dental_documentation import (
 )
 from app.services.llm_processor import EnhancedDocumentationProcessor, LLMExtractionError
 from app.services.pipeline_processor import ProcessingPipeline
+from app.services.code_catalog import load_catalog
 from app.services.documentation_error import DocumentationError
 from app.core.config import settings
 
 logger = structlog.get_logger()
 
 
+def compile_term_pattern(terms) -> re.Pattern:
+    """
+    Compile literal terms into one whole-word regex factored as a prefix trie
+    
+    Shared prefixes are matched once, so a single scan finds the leftmost,
+    longest term far faster than trying every term (or a flat alternation).
+    Terms only match between non-word characters, so "drei" is never taken
+    out of "dreizehn".
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A term ending here makes the rest optional; greedy matching prefers the longer term
+        return f"(?:{body})?" if "" in node else body
+    
+    return re.compile(rf"(?<!\w)(?:{build(trie)})(?!\w)")
+
+
 class GermanDentalTerminology:
-    """German dental terminology and mappings"""
+    """German dental terminology and mappings (read-only lookup tables)"""
+    
+    __slots__ = ()
     
     # Tooth number mappings (spoken to FDI)
-    TOOTH_NUMBERS = {
+    TOOTH_NUMBERS = MappingProxyType({
         # Spoken German to FDI notation
         "eins eins": "11", "eins-eins": "11", "elf": "11",
         "eins zwei": "12", "eins-zwei": "12", "zwölf": "12",
@@ -65,20 +97,21 @@ class GermanDentalTerminology:
         "vier sechs": "46", "vier-sechs": "46", "sechsundvierzig": "46",
         "vier sieben": "47", "vier-sieben": "47", "siebenundvierzig": "47",
         "vier acht": "48", "vier-acht": "48", "achtundvierzig": "48",
-    }
+    })
+    TOOTH_NUMBER_PATTERN = compile_term_pattern(TOOTH_NUMBERS)
     
     # Surface terminology
-    SURFACES = {
+    SURFACES = MappingProxyType({
         "okklusal": "okklusal", "okklusional": "okklusal", "kaufläche": "okklusal",
         "mesial": "mesial", "mesialer": "mesial", "zur mitte": "mesial",
         "distal": "distal", "distaler": "distal", "zur seite": "distal",
         "vestibulär": "vestibulär", "labial": "labial", "bukkaler": "bukkal",
         "palatinal": "palatinal", "lingual": "lingual", "zungenseitig": "lingual",
         "approximal": "approximal", "cervical": "cervical"
-    }
+    })
     
     # Common diagnoses and findings
-    DIAGNOSES = {
+    DIAGNOSES = MappingProxyType({
         "karies": "Karies",
         "karies profunda": "Karies profunda", 
         "karies media": "Karies media",
@@ -92,10 +125,10 @@ class GermanDentalTerminology:
         "fraktur": "Fraktur",
         "wurzelkaries": "Wurzelkaries",
         "sekundärkaries": "Sekundärkaries"
-    }
+    })
     
     # Treatment procedures
-    PROCEDURES = {
+    PROCEDURES = MappingProxyType({
         "füllung": "Füllung",
         "kompositfüllung": "Kompositfüllung", 
         "amalgamfüllung": "Amalgamfüllung",
@@ -114,16 +147,45 @@ class GermanDentalTerminology:
         "zahnsteinentfernung": "Zahnsteinentfernung",
         "politur": "Politur",
         "fluoridierung": "Fluoridierung"
-    }
+    })
+
+
+class CodeHit(NamedTuple):
+    """A catalog code matched for a procedure, with its computed fee"""
+    code: str
+    system: str
+    description: str
+    points: int
+    factor: Optional[float]
+    fee_euros: float
 
 
 class BEMAGOZMapper:
     """Enhanced BEMA/GOZ mapper with real database"""
     
+    # Filling surface_mapping keys by surface count (four or more share the last)
+    SURFACE_KEYS = ("einflächig", "zweiflächig", "dreiflächig", "vierflächig")
+    
+    __slots__ = (
+        "codes_data", "bema_point_value", "goz_point_value",
+        "_indexed_codes", "_keyword_index", "_code_hits", "_find_codes_cached",
+    )
+    
     def __init__(self):
         self.codes_data = self._load_codes_database()
         self.bema_point_value = self.codes_data["meta"]["bema_point_value"]
         self.goz_point_value = self.codes_data["meta"]["goz_point_value"]
+        self._indexed_codes, self._keyword_index = self._build_keyword_index()
+        
+        # Fees depend only on the catalog, so every hit is built once up front
+        self._code_hits = {
+            (system, code_id): self._build_code_hit(system, code_info)
+            for system in ("bema", "goz")
+            for code_id, code_info in self.codes_data[f"{system}_codes"].items()
+        }
+        
+        # Procedures recur across requests; the lookup is pure given the catalog
+        self._find_codes_cached = lru_cache(maxsize=512)(self._find_codes)
         
         logger.info("BEMA/GOZ database loaded", 
                    version=self.codes_data["meta"]["version"],
@@ -132,20 +194,35 @@ class BEMAGOZMapper:
     
     def _load_codes_database(self) -> dict:
         """Load BEMA/GOZ codes from JSON database"""
-        import json
-        from pathlib import Path
-        
-        # Try to load from data directory
-        data_file = Path(__file__).parent.parent.parent / "data" / "bema_goz_codes.json"
-        
         try:
-            with open(data_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            # Parsed once per process and shared by all mappers
+            return load_catalog()
         except FileNotFoundError:
             logger.warning("BEMA/GOZ database file not found, using fallback codes")
             # Fallback to minimal hardcoded data
             return self._get_fallback_codes()
     
+    def _build_keyword_index(self) -> Tuple[List[Tuple[str, str]], Dict[str, List[int]]]:
+        """
+        Invert the catalog into keyword -> codes
+        
+        Returns the (system, code_id) pairs in catalog order (BEMA first) and,
+        per distinct keyword, the positions of the codes it selects, so a
+        keyword search tests each keyword once and still yields catalog order.
+        Keywords are lower-cased here, matching the lower-cased procedure
+        text they are searched in.
+        """
+        indexed_codes = []
+        keyword_index = defaultdict(list)
+        
+        for system in ("bema", "goz"):
+            for code_id, code_info in self.codes_data[f"{system}_codes"].items():
+                for keyword in code_info.get("keywords", []):
+                    keyword_index[keyword.lower()].append(len(indexed_codes))
+                indexed_codes.append((system, code_id))
+        
+        return indexed_codes, dict(keyword_index)
+    
     def _get_fallback_codes(self) -> dict:
         """Fallback BEMA/GOZ codes if database file not available"""
         return {
@@ -168,7 +245,7 @@ class BEMAGOZMapper:
             }
         }
     
-    def find_codes_for_procedure(self, procedure: str, procedure_details: dict = None) -> List[dict]:
+    def find_codes_for_procedure(self, procedure: str, procedure_details: dict = None) -> List[CodeHit]:
         """
         Find appropriate BEMA/GOZ codes for a procedure
         
@@ -177,9 +254,17 @@ class BEMAGOZMapper:
             procedure_details: Additional details like surfaces, tooth type, etc.
             
         Returns:
-            List of matching code dictionaries
+            List of matching codes
         """
-        procedure_lower = procedure.lower()
+        frozen_details = tuple(sorted(
+            (key, tuple(sorted(value)) if isinstance(value, list) else value)
+            for key, value in procedure_details.items()
+        )) if procedure_details else None
+        
+        return list(self._find_codes_cached(procedure.lower(), frozen_details))
+    
+    def _find_codes(self, procedure_lower: str, frozen_details: Optional[tuple]) -> Tuple[CodeHit, ...]:
+        procedure_details = dict(frozen_details) if frozen_details else None
         matching_codes = []
         
         # Check procedure mappings first
@@ -190,24 +275,14 @@ class BEMAGOZMapper:
                 codes_to_use = self._get_specific_mapping(mapping, procedure_details)
                 
                 for system, code_id in codes_to_use.items():
-                    if system == "bema" and code_id in self.codes_data["bema_codes"]:
-                        code_info = self.codes_data["bema_codes"][code_id].copy()
-                        code_info["system"] = "bema"
-                        code_info["fee_euros"] = self._calculate_bema_fee(code_info["points"])
-                        matching_codes.append(code_info)
-                    elif system == "goz" and code_id in self.codes_data["goz_codes"]:
-                        code_info = self.codes_data["goz_codes"][code_id].copy() 
-                        code_info["system"] = "goz"
-                        factor = code_info.get("standard_factor", 2.3)
-                        code_info["fee_euros"] = self._calculate_goz_fee(code_info["points"], factor)
-                        code_info["factor"] = factor
-                        matching_codes.append(code_info)
+                    if (system, code_id) in self._code_hits:
+                        matching_codes.append(self._code_hits[system, code_id])
         
         # Fallback: search by keywords if no direct mapping found
         if not matching_codes:
             matching_codes = self._search_by_keywords(procedure_lower)
         
-        return matching_codes
+        return tuple(matching_codes)
     
     def _get_specific_mapping(self, mapping: dict, details: dict = None) -> dict:
         """Get specific code mapping based on procedure details"""
@@ -216,7 +291,7 @@ class BEMAGOZMapper:
         # Handle surface-based mappings (fillings)
         if "surface_mapping" in mapping and details and "surfaces" in details:
             surface_count = len(details["surfaces"])
-            surface_key = f"{['einflächig', 'zweiflächig', 'dreiflächig', 'vierflächig'][min(surface_count-1, 3)]}"
+            surface_key = self.SURFACE_KEYS[min(surface_count - 1, 3)]
             
             if surface_key in mapping["surface_mapping"]:
                 return mapping["surface_mapping"][surface_key]
@@ -236,29 +311,34 @@ class BEMAGOZMapper:
             
         return codes
     
-    def _search_by_keywords(self, procedure: str) -> List[dict]:
+    def _search_by_keywords(self, procedure: str) -> List[CodeHit]:
         """Search codes by matching keywords"""
-        matching_codes = []
+        matched = {
+            position
+            for keyword, positions in self._keyword_index.items()
+            if keyword in procedure
+            for position in positions
+        }
         
-        # Search BEMA codes
-        for code_id, code_info in self.codes_data["bema_codes"].items():
-            if any(keyword in procedure for keyword in code_info.get("keywords", [])):
-                enhanced_info = code_info.copy()
-                enhanced_info["system"] = "bema"
-                enhanced_info["fee_euros"] = self._calculate_bema_fee(code_info["points"])
-                matching_codes.append(enhanced_info)
-        
-        # Search GOZ codes
-        for code_id, code_info in self.codes_data["goz_codes"].items():
-            if any(keyword in procedure for keyword in code_info.get("keywords", [])):
-                enhanced_info = code_info.copy()
-                enhanced_info["system"] = "goz"
-                factor = code_info.get("standard_factor", 2.3)
-                enhanced_info["fee_euros"] = self._calculate_goz_fee(code_info["points"], factor)
-                enhanced_info["factor"] = factor
-                matching_codes.append(enhanced_info)
-        
-        return matching_codes
+        return [self._code_hits[self._indexed_codes[position]] for position in sorted(matched)]
+    
+    def _build_code_hit(self, system: str, code_info: dict) -> CodeHit:
+        """Resolve a catalog entry to a CodeHit with its computed fee"""
+        if system == "bema":
+            factor = None
+            fee = self._calculate_bema_fee(code_info["points"])
+        else:
+            factor = code_info.get("standard_factor", 2.3)
+            fee = self._calculate_goz_fee(code_info["points"], factor)
+        
+        return CodeHit(
+            code=code_info["code"],
+            system=system,
+            description=code_info["description"],
+            points=code_info.get("points"),
+            factor=factor,
+            fee_euros=fee
+        )
     
     def _calculate_goz_fee(self, points: int, factor: float = 2.3) -> float:
         """Calculate GOZ fee based on points and factor"""
@@ -272,6 +352,60 @@ class BEMAGOZMapper:
 class DocumentationProcessor:
     """Main processor for converting speech to structured documentation"""
     
+    __slots__ = (
+        "terminology", "billing_mapper", "llm_processor", "pipeline_processor",
+        "use_llm_extraction", "use_multi_stage_pipeline",
+    )
+    
+    WHITESPACE_PATTERN = re.compile(r'\s+')
+    
+    # Typographic dashes and non-breaking spaces to the ASCII forms the
+    # terminology tables use ("eins–eins" must match "eins-eins")
+    PUNCTUATION_TABLE = str.maketrans({
+        "\u2010": "-", "\u2011": "-", "\u2012": "-", "\u2013": "-", "\u2014": "-", "\u2212": "-",
+        "\u00a0": " ", "\u202f": " ",
+    })
+    
+    # Pattern to match: "Zahn X [surface] [diagnosis]"
+    FINDING_PATTERNS = [
+        re.compile(r'zahn\s+(\d{1,2})\s+(okklusal|mesial|distal|vestibulär|palatinal)?\s*(karies\s*\w*)', re.IGNORECASE),
+        re.compile(r'(\d{1,2})\s+(okklusal|mesial|distal|vestibulär|palatinal)\s+(karies\s*\w*)', re.IGNORECASE),
+        re.compile(r'(\d{1,2})\s+(pulpitis|parodontitis|gingivitis)', re.IGNORECASE),
+    ]
+    
+    TOOTH_NUMBER_PATTERN = re.compile(r'\b(\d{1,2})\b')
+    
+    SURFACE_TERMS = ("okklusal", "mesial", "distal", "vestibulär", "palatinal", "lingual")
+    
+    # Treatment type keywords, in priority order
+    TREATMENT_KEYWORDS = (
+        (TreatmentType.FILLING, ("füllung", "komposit", "amalgam", "inlay", "onlay")),
+        (TreatmentType.EXTRACTION, ("extraktion", "ziehen", "entfernung")),
+        (TreatmentType.ROOT_CANAL, ("wurzelkanal", "wurzelfüllung", "trepanation", "endodontie")),
+        (TreatmentType.CROWN, ("krone", "überkronung")),
+        (TreatmentType.PROPHYLAXIS, ("prophylaxe", "zahnreinigung", "scaling", "politur")),
+        (TreatmentType.EXAMINATION, ("untersuchung", "kontrolle", "befundung")),
+        (TreatmentType.SURGERY, ("chirurgie", "operation", "schnitt", "naht")),
+    )
+    
+    # Material and anesthesia keywords -> canonical names, in reporting order
+    MATERIAL_KEYWORDS = (
+        ("komposit", "Komposit"),
+        ("amalgam", "Amalgam"),
+        ("keramik", "Keramik"),
+        ("artikain", "Artikain"),
+        ("lidocain", "Lidocain"),
+        ("fluorid", "Fluorid"),
+        ("chlorhexidin", "Chlorhexidin"),
+    )
+    
+    ANESTHESIA_KEYWORDS = (
+        ("lokalanästhesie", "Lokalanästhesie"),
+        ("infiltrationsanästhesie", "Infiltrationsanästhesie"),
+        ("leitungsanästhesie", "Leitungsanästhesie"),
+        ("oberflächenanästhesie", "Oberflächenanästhesie"),
+    )
+    
     def __init__(self):
         self.terminology = GermanDentalTerminology()
         self.billing_mapper = BEMAGOZMapper()
@@ -288,11 +422,11 @@ class DocumentationProcessor:
         """
         Process transcription result into structured dental documentation
         """
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
-        logger.info("Starting transcription processing", 
-                   text_length=len(transcription_result.text),
-                   confidence=transcription_result.confidence)
+        logger.debug("Starting transcription processing",
+                    text_length=len(transcription_result.text),
+                    confidence=transcription_result.confidence)
         
         try:
             # Normalize the text
@@ -306,9 +440,8 @@ class DocumentationProcessor:
             
             # Choose processing method based on configuration
             if self.use_multi_stage_pipeline:
+                extraction_method = "multi_stage_pipeline"
                 try:
-                    logger.info("🚀 Using multi-stage AI pipeline for enhanced processing")
-                    
                     # Run the sophisticated multi-stage pipeline
                     pipeline_result = await self.pipeline_processor.process_complete(
                         normalized_text, 
@@ -319,49 +452,37 @@ class DocumentationProcessor:
                     
                     # Extract procedures from pipeline result
                     procedures = [proc["name"] for proc in final_output.get("procedures", [])]
-                    billing_codes_data = final_output.get("billing_codes", [])
-                    
-                    # Convert billing codes format
-                    billing_codes = []
-                    for code_data in billing_codes_data:
-                        billing_code = BillingCode(
-                            code=code_data["code"],
-                            system=BillingSystem.BEMA if code_data["system"] == "bema" else BillingSystem.GOZ,
-                            description=code_data["description"],
-                            factor=code_data.get("factor"),
-                            points=code_data.get("points"),
-                            fee_euros=code_data.get("fee_euros"),
-                            confidence=ConfidenceLevel.HIGH if code_data.get("confidence", 0) > 0.8 else ConfidenceLevel.MEDIUM
-                        )
-                        billing_codes.append(billing_code)
+                    billing_codes = self._convert_llm_billing_codes(final_output.get("billing_codes", []))
                     
                     # Log pipeline stages performance
                     stages = pipeline_result.get("pipeline_stages", {})
-                    logger.info("🎯 Multi-stage pipeline completed",
-                               normalization_time=stages.get("normalization", {}).get("processing_time_ms", 0),
-                               billing_mapping_time=stages.get("billing_mapping", {}).get("processing_time_ms", 0),
-                               audit_time=stages.get("plausibility_check", {}).get("processing_time_ms", 0),
-                               total_time=final_output.get("total_processing_time_ms", 0),
-                               procedures_found=len(procedures),
-                               billing_codes=len(billing_codes),
-                               pipeline_confidence=final_output.get("confidence", 0))
+                    logger.debug("🎯 Multi-stage pipeline completed",
+                                normalization_time=stages.get("normalization", {}).get("processing_time_ms", 0),
+                                billing_mapping_time=stages.get("billing_mapping", {}).get("processing_time_ms", 0),
+                                audit_time=stages.get("plausibility_check", {}).get("processing_time_ms", 0),
+                                total_time=final_output.get("total_processing_time_ms", 0),
+                                procedures_found=len(procedures),
+                                billing_codes=len(billing_codes),
+                                pipeline_confidence=final_output.get("confidence", 0))
                     
                 except Exception as e:
                     logger.warning("🚨 Multi-stage pipeline failed, falling back to simple LLM", error=str(e))
                     # Fallback to simple LLM method
                     if self.use_llm_extraction:
+                        extraction_method = "llm"
                         llm_result = await self.llm_processor.extract_procedures_intelligent(
                             normalized_text, bema_goz_catalog, findings
                         )
                         procedures = [proc["name"] for proc in llm_result.get("procedures", [])]
                         billing_codes = self._convert_llm_billing_codes(llm_result.get("billing_codes", []))
                     else:
+                        extraction_method = "keyword"
                         procedures = self._extract_procedures(normalized_text)
                         billing_codes = self._generate_billing_codes(procedures, findings)
                         
             elif self.use_llm_extraction:
+                extraction_method = "llm"
                 try:
-                    logger.info("🧠 Using simple LLM extraction")
                     llm_result = await self.llm_processor.extract_procedures_intelligent(
                         normalized_text, 
                         bema_goz_catalog, 
@@ -372,35 +493,36 @@ class DocumentationProcessor:
                     procedures = [proc["name"] for proc in llm_result.get("procedures", [])]
                     billing_codes = self._convert_llm_billing_codes(llm_result.get("billing_codes", []))
                     
-                    logger.info("LLM procedure extraction completed",
-                               procedures_found=len(procedures),
-                               billing_codes=len(billing_codes),
-                               overall_confidence=llm_result.get("confidence_overall", 0))
+                    logger.debug("LLM procedure extraction completed",
+                                procedures_found=len(procedures),
+                                billing_codes=len(billing_codes),
+                                overall_confidence=llm_result.get("confidence_overall", 0))
                     
                 except Exception as e:
                     logger.warning("LLM extraction failed, falling back to traditional method", error=str(e))
                     # Fallback to traditional method
+                    extraction_method = "keyword"
                     procedures = self._extract_procedures(normalized_text)
                     billing_codes = self._generate_billing_codes(procedures, findings)
             else:
                 # Traditional extraction method
-                logger.info("📝 Using traditional keyword-based extraction")
+                extraction_method = "keyword"
                 procedures = self._extract_procedures(normalized_text)
                 billing_codes = self._generate_billing_codes(procedures, findings)
             
             # Generate treatment plan
             treatment_plan = self._generate_treatment_plan(findings, procedures)
             
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = (time.perf_counter_ns() - start_time) // 1_000_000
             
             logger.info("Transcription processing completed",
+                       extraction_method=extraction_method,
                        findings_count=len(findings),
                        procedures_count=len(procedures),
                        billing_codes_count=len(billing_codes),
                        processing_time_ms=processing_time)
             
             # Generate required IDs
-            import uuid
             recording_id = f"rec_{int(time.time())}_{uuid.uuid4().hex[:8]}"
             
             return DentalDocumentation(
@@ -420,52 +542,35 @@ class DocumentationProcessor:
     
     def _normalize_text(self, text: str) -> str:
         """Normalize text for better processing"""
-        # Convert to lowercase
-        text = text.lower()
+        # Convert to lowercase and unify dashes/spaces in one C-level pass each
+        text = text.lower().translate(self.PUNCTUATION_TABLE)
         
-        # Replace tooth number variations
-        for spoken, fdi in self.terminology.TOOTH_NUMBERS.items():
-            text = text.replace(spoken, fdi)
+        # Replace tooth number variations in a single scan
+        tooth_numbers = self.terminology.TOOTH_NUMBERS
+        text = self.terminology.TOOTH_NUMBER_PATTERN.sub(lambda match: tooth_numbers[match.group(0)], text)
         
         # Normalize common variations
-        text = re.sub(r'\s+', ' ', text)  # Multiple spaces to single
+        text = self.WHITESPACE_PATTERN.sub(' ', text)  # Multiple spaces to single
         text = text.strip()
         
         return text
     
     def _identify_treatment_type(self, text: str) -> Optional[TreatmentType]:
         """Identify the primary treatment type from text"""
-        
-        treatment_keywords = {
-            TreatmentType.FILLING: ["füllung", "komposit", "amalgam", "inlay", "onlay"],
-            TreatmentType.EXTRACTION: ["extraktion", "ziehen", "entfernung"],
-            TreatmentType.ROOT_CANAL: ["wurzelkanal", "wurzelfüllung", "trepanation", "endodontie"],
-            TreatmentType.CROWN: ["krone", "überkronung"],
-            TreatmentType.PROPHYLAXIS: ["prophylaxe", "zahnreinigung", "scaling", "politur"],
-            TreatmentType.EXAMINATION: ["untersuchung", "kontrolle", "befundung"],
-            TreatmentType.SURGERY: ["chirurgie", "operation", "schnitt", "naht"]
-        }
-        
-        for treatment_type, keywords in treatment_keywords.items():
-            if any(keyword in text for keyword in keywords):
-                return treatment_type
+        # Types are checked in priority order, not by position in the text
+        for treatment_type, keywords in self.TREATMENT_KEYWORDS:
+            for keyword in keywords:
+                if keyword in text:
+                    return treatment_type
                 
         return None
     
     def _extract_findings(self, text: str) -> List[DentalFinding]:
-        """Extract dental findings and diagnoses"""
+        """Extract dental findings and diagnoses from normalized (lower-cased) text"""
         findings = []
         
-        # Pattern to match: "Zahn X [surface] [diagnosis]"
-        patterns = [
-            r'zahn\s+(\d{1,2})\s+(okklusal|mesial|distal|vestibulär|palatinal)?\s*(karies\s*\w*)',
-            r'(\d{1,2})\s+(okklusal|mesial|distal|vestibulär|palatinal)\s+(karies\s*\w*)',
-            r'(\d{1,2})\s+(pulpitis|parodontitis|gingivitis)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for pattern in self.FINDING_PATTERNS:
+            for match in pattern.finditer(text):
                 groups = match.groups()
                 
                 if len(groups) >= 3:  # zahn pattern
@@ -492,13 +597,15 @@ class DocumentationProcessor:
     
     def _extract_procedures(self, text: str) -> List[str]:
         """Extract performed procedures"""
-        procedures = []
-        
-        for procedure_key, procedure_name in self.terminology.PROCEDURES.items():
-            if procedure_key in text:
-                procedures.append(procedure_name)
-        
-        return list(set(procedures))  # Remove duplicates
+        # Substring tests on ~20 keys beat a single trie-regex scan here: `in`
+        # runs CPython's vectorised search, while the regex steps per character.
+        # Nested keys ("füllung" in "kompositfüllung") must all be reported.
+        # Deduplicated in catalog order so downstream prompts are deterministic
+        return list(dict.fromkeys(
+            procedure_name
+            for procedure_key, procedure_name in self.terminology.PROCEDURES.items()
+            if procedure_key in text
+        ))
     
     def _generate_billing_codes(self, procedures: List[str], findings: List[DentalFinding]) -> List[BillingCode]:
         """Generate appropriate billing codes based on procedures and findings"""
@@ -511,15 +618,15 @@ class DocumentationProcessor:
             # Find matching codes using enhanced mapper
             matching_codes = self.billing_mapper.find_codes_for_procedure(procedure, procedure_details)
             
-            for code_info in matching_codes:
+            for hit in matching_codes:
                 # Create BillingCode object
                 billing_code = BillingCode(
-                    code=code_info["code"],
-                    system=BillingSystem.BEMA if code_info["system"] == "bema" else BillingSystem.GOZ,
-                    description=code_info["description"],
-                    factor=code_info.get("factor"),
-                    points=code_info.get("points"),
-                    fee_euros=code_info.get("fee_euros"),
+                    code=hit.code,
+                    system=BillingSystem.BEMA if hit.system == "bema" else BillingSystem.GOZ,
+                    description=hit.description,
+                    factor=hit.factor,
+                    points=hit.points,
+                    fee_euros=hit.fee_euros,
                     confidence=ConfidenceLevel.HIGH if len(matching_codes) == 1 else ConfidenceLevel.MEDIUM
                 )
                 billing_codes.append(billing_code)
@@ -529,35 +636,35 @@ class DocumentationProcessor:
     def _analyze_procedure_context(self, procedure: str, findings: List[DentalFinding]) -> dict:
         """Analyze procedure context to determine specific billing requirements"""
         context = {}
+        procedure_lower = procedure.lower()
         
-        # Analyze surface count for fillings
-        if "füllung" in procedure.lower():
-            # Count affected surfaces from findings
-            surfaces = set()
-            for finding in findings:
-                if finding.surface:
-                    surfaces.add(finding.surface)
-            
-            if surfaces:
-                context["surfaces"] = list(surfaces)
-                context["surface_count"] = len(surfaces)
-        
-        # Analyze tooth type for extractions/root canals
-        if any(term in procedure.lower() for term in ["extraktion", "wurzelkanal"]):
-            # Determine if teeth are anterior (single root) or posterior (multi-root)
-            tooth_types = set()
-            for finding in findings:
-                if finding.tooth_number:
-                    tooth_num = int(finding.tooth_number) if finding.tooth_number.isdigit() else 0
-                    # Molars (6,7,8) are multi-root, others typically single-root
-                    if tooth_num % 10 in [6, 7, 8]:
-                        tooth_types.add("mehrwurzelig")
-                    else:
-                        tooth_types.add("einwurzelig")
+        # Fillings need the affected surfaces; extractions/root canals the tooth type
+        is_filling = "füllung" in procedure_lower
+        needs_tooth_type = "extraktion" in procedure_lower or "wurzelkanal" in procedure_lower
+        if not (is_filling or needs_tooth_type):
+            return context
+        
+        surfaces = set()
+        single_root = multi_root = False
+        for finding in findings:
+            if is_filling and finding.surface:
+                surfaces.add(finding.surface)
             
-            if tooth_types:
-                # Use most conservative (single root) if mixed
-                context["tooth_type"] = "einwurzelig" if "einwurzelig" in tooth_types else "mehrwurzelig"
+            tooth_number = finding.tooth_number
+            if needs_tooth_type and tooth_number:
+                # Molars (6,7,8) are multi-root, others (and unparsable numbers) single-root
+                if tooth_number.isdigit() and tooth_number[-1] in "678":
+                    multi_root = True
+                else:
+                    single_root = True
+        
+        if surfaces:
+            context["surfaces"] = list(surfaces)
+            context["surface_count"] = len(surfaces)
+        
+        if single_root or multi_root:
+            # Use most conservative (single root) if mixed
+            context["tooth_type"] = "einwurzelig" if single_root else "mehrwurzelig"
         
         return context
     
@@ -565,18 +672,18 @@ class DocumentationProcessor:
         """Generate treatment planning recommendations"""
         recommendations = []
         
-        # Look for planning keywords in findings
-        if findings:
-            all_diagnoses = " ".join([f.diagnosis.lower() for f in findings])
-            
-            if "kontrolle" in all_diagnoses or "nachkontrolle" in all_diagnoses:
-                recommendations.append("Nachkontrolle in 1-2 Wochen")
-            
-            if "wurzelkanal" in all_diagnoses and "abschluss" not in all_diagnoses:
-                recommendations.append("Wurzelkanalbehandlung fortsetzen")
+        # Look for planning keywords in findings; joined once and lower-cased
+        # once so substring checks still match inside German compounds
+        all_diagnoses = " ".join([f.diagnosis for f in findings]).lower()
+        
+        if "kontrolle" in all_diagnoses or "nachkontrolle" in all_diagnoses:
+            recommendations.append("Nachkontrolle in 1-2 Wochen")
+        
+        if "wurzelkanal" in all_diagnoses and "abschluss" not in all_diagnoses:
+            recommendations.append("Wurzelkanalbehandlung fortsetzen")
         
         # Look for planning keywords in procedures
-        all_procedures = " ".join([p.lower() for p in procedures])
+        all_procedures = " ".join(procedures).lower()
         
         if "extraktion" in all_procedures:
             recommendations.append("Nachkontrolle in 3-5 Tagen")
@@ -585,7 +692,7 @@ class DocumentationProcessor:
             recommendations.append("Kaufläche prüfen bei nächstem Termin")
         
         # Check for caries in findings
-        if findings and any("karies" in finding.diagnosis.lower() for finding in findings):
+        if "karies" in all_diagnoses:
             recommendations.append("Weitere kariöse Läsionen prüfen")
         
         if recommendations:
@@ -619,79 +726,41 @@ class DocumentationProcessor:
         return ". ".join(notes)
     
     def _extract_materials(self, text: str) -> List[str]:
-        """Extract materials and medications used"""
-        materials = []
-        
-        material_keywords = {
-            "komposit": "Komposit",
-            "amalgam": "Amalgam", 
-            "keramik": "Keramik",
-            "artikain": "Artikain",
-            "lidocain": "Lidocain",
-            "fluorid": "Fluorid",
-            "chlorhexidin": "Chlorhexidin"
-        }
-        
-        for keyword, material in material_keywords.items():
-            if keyword in text:
-                materials.append(material)
-        
-        return materials
+        """Extract materials and medications used from normalized (lower-cased) text"""
+        return [material for keyword, material in self.MATERIAL_KEYWORDS if keyword in text]
     
     def _extract_anesthesia(self, text: str) -> Optional[str]:
-        """Extract anesthesia type if mentioned"""
-        anesthesia_types = {
-            "lokalanästhesie": "Lokalanästhesie",
-            "infiltrationsanästhesie": "Infiltrationsanästhesie", 
-            "leitungsanästhesie": "Leitungsanästhesie",
-            "oberflächenanästhesie": "Oberflächenanästhesie"
-        }
-        
-        for keyword, anesthesia in anesthesia_types.items():
-            if keyword in text:
-                return anesthesia
-        
-        return None
+        """Extract anesthesia type if mentioned in normalized (lower-cased) text"""
+        return next((anesthesia for keyword, anesthesia in self.ANESTHESIA_KEYWORDS if keyword in text), None)
     
     def _normalize_surface(self, surface_text: str) -> Optional[str]:
-        """Normalize surface descriptions"""
-        surface_text = surface_text.lower().strip()
+        """Normalize surface descriptions matched in lower-cased text"""
+        surface_text = surface_text.strip()
         return self.terminology.SURFACES.get(surface_text)
     
     def _normalize_diagnosis(self, diagnosis_text: str) -> str:
-        """Normalize diagnosis descriptions"""
-        diagnosis_text = diagnosis_text.lower().strip()
+        """Normalize diagnosis descriptions matched in lower-cased text"""
+        diagnosis_text = diagnosis_text.strip()
         return self.terminology.DIAGNOSES.get(diagnosis_text, diagnosis_text.title())
     
     def _extract_dental_findings(self, text: str) -> List[DentalFinding]:
         """Extract dental findings from normalized text"""
-        findings = []
-        
-        # Use existing findings extraction but format for DentalFinding objects
-        raw_findings = self._extract_findings(text)
-        
-        for finding in raw_findings:
-            # Extract tooth number from finding text
-            tooth_match = re.search(r'\b(\d{1,2})\b', finding)
-            tooth_number = tooth_match.group(1) if tooth_match else None
-            
-            # Extract surface information
-            surface = None
-            for surface_term in ['okklusal', 'mesial', 'distal', 'vestibulär', 'palatinal', 'lingual']:
-                if surface_term in finding.lower():
-                    surface = surface_term
-                    break
+        findings = {}
+        
+        for finding in self._extract_findings(text):
+            # The finding patterns only capture a surface for "zahn X" phrases;
+            # fall back to a surface named inside the diagnosis itself
+            if finding.surface is None:
+                diagnosis_lower = finding.diagnosis.lower()
+                finding.surface = next((term for term in self.SURFACE_TERMS if term in diagnosis_lower), None)
+            if finding.severity is None:
+                finding.severity = "normal"  # Could be enhanced with LLM
             
-            dental_finding = DentalFinding(
-                tooth_number=tooth_number,
-                diagnosis=finding,
-                surface=surface,
-                severity="normal",  # Could be enhanced with LLM
-                confidence=ConfidenceLevel.MEDIUM
-            )
-            findings.append(dental_finding)
+            # "zahn 36 okklusal karies" matches both the zahn and the bare
+            # number pattern; report each finding once
+            findings.setdefault((finding.tooth_number, finding.surface, finding.diagnosis), finding)
         
-        return findings
+        return list(findings.values())
     
     def _convert_llm_billing_codes(self, llm_billing_codes: List[Dict]) -> List[BillingCode]:
         """Convert LLM billing codes format to BillingCode objects"""
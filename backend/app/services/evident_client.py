@@ -14,6 +14,11 @@ logger = structlog.get_logger()
 class EvidentPatient:
     """Patient data structure for Evident"""
     
+    __slots__ = (
+        "patient_id", "first_name", "last_name", "birth_date",
+        "insurance_number", "phone", "email", "address",
+    )
+    
     def __init__(
         self,
         patient_id: str,
@@ -38,6 +43,8 @@ class EvidentPatient:
 class EvidentTreatment:
     """Treatment data structure for Evident"""
     
+    __slots__ = ("treatment_id", "patient_id", "treatment_date", "diagnosis", "notes", "codes")
+    
     def __init__(
         self,
         treatment_id: str,
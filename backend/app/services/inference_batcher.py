@@ -0,0 +1,119 @@
+"""
+Inference Batcher
+Coalesces concurrent transcription requests into batched model calls
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Optional
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class InferenceBatcher:
+    """
+    Collects pending requests for a short window and runs them as one batch.
+
+    Requests are grouped by duration bin so clips of similar length share a
+    forward pass and padding waste stays low. The batch function receives a
+    list of items and returns one result per item; a returned exception is
+    raised to that item's caller only.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list], Awaitable[list]],
+        max_batch_size: int = 16,
+        window_ms: int = 20,
+        duration_bin_seconds: float = 2.0,
+        max_in_flight: int = 1,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.window_seconds = window_ms / 1000
+        self.duration_bin_seconds = duration_bin_seconds
+        self.max_in_flight = max(1, max_in_flight)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight: set = set()
+
+    async def submit(self, item: Any, duration_seconds: float = 0.0) -> Any:
+        """Queue an item for the next batch and wait for its result"""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((future, item, duration_seconds))
+        return await future
+
+    async def stop(self):
+        """Cancel the background worker"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+        self._queue = None
+
+    def _ensure_worker(self):
+        """Start the drain task lazily on the running event loop"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            # Wait for a free slot first so requests keep queueing (and batch
+            # up) while every slot is busy
+            await self._slots.acquire()
+            try:
+                pending = [await self._queue.get()]
+            except BaseException:
+                self._slots.release()
+                raise
+            deadline = loop.time() + self.window_seconds
+
+            while len(pending) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            bins = defaultdict(list)
+            for entry in pending:
+                bins[int(entry[2] // self.duration_bin_seconds)].append(entry)
+
+            task = asyncio.create_task(self._dispatch(list(bins.values())))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, groups: list):
+        try:
+            for entries in groups:
+                await self._run_batch(entries)
+        finally:
+            self._slots.release()
+
+    async def _run_batch(self, entries: list):
+        logger.debug("Dispatching inference batch", batch_size=len(entries))
+
+        try:
+            results = await self.batch_fn([item for _, item, _ in entries])
+        except Exception as e:
+            results = [e] * len(entries)
+
+        for (future, _, _), result in zip(entries, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
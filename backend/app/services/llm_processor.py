@@ -44,10 +44,11 @@ class LLMProcedureExtractor:
         }
         
         if self.model not in valid_models:
-            logger.warning(f"Model {self.model} not in validated list. Using anyway but results may vary.")
+            logger.warning("Model not in validated list. Using anyway but results may vary.", model=self.model)
         else:
             model_info = valid_models[self.model]
-            logger.info(f"Using LLM model: {self.model}", 
+            logger.info("Using LLM model",
+                       model=self.model,
                        reasoning_quality=model_info["reasoning"],
                        cost_tier=model_info["cost"],
                        speed_tier=model_info["speed"],
@@ -55,9 +56,9 @@ class LLMProcedureExtractor:
             
             # Inform about access requirements
             if model_info["availability"] == "limited_preview":
-                logger.warning(f"⚠️  {self.model} requires OpenAI waitlist approval for access")
+                logger.warning("⚠️  Model requires OpenAI waitlist approval for access", model=self.model)
             elif model_info["availability"] == "research_preview":
-                logger.warning(f"⚠️  {self.model} only available for approved research projects")
+                logger.warning("⚠️  Model only available for approved research projects", model=self.model)
             
             # Recommend best available option
             if self.model not in ["o3-mini", "o3", "gpt-4o"]:
@@ -83,7 +84,7 @@ class LLMProcedureExtractor:
         if not self.api_key:
             raise LLMExtractionError("OpenAI API key not configured")
         
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         try:
             import openai
@@ -123,7 +124,7 @@ class LLMProcedureExtractor:
                 max_tokens=self.max_tokens
             )
             
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = (time.perf_counter_ns() - start_time) // 1_000_000
             
             # Parse the response
             result_text = response.choices[0].message.content
@@ -11,6 +11,7 @@ import structlog
 from app.core.config import settings
 from app.schemas.dental_documentation import DentalFinding, BillingCode, BillingSystem, ConfidenceLevel
 from app.services.llm_processor import LLMExtractionError
+from app.services.code_catalog import load_catalog
 
 logger = structlog.get_logger()
 
@@ -37,15 +38,15 @@ class TextNormalizationStage(PipelineStage):
     
     async def process(self, raw_text: str) -> Dict[str, Any]:
         """Clean up transcription with proper punctuation and terminology"""
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         try:
             import openai
             client = openai.OpenAI(api_key=self.api_key)
             
-            logger.info("Starting text normalization", 
-                       text_length=len(raw_text), 
-                       model=self.model)
+            logger.debug("Starting text normalization",
+                        text_length=len(raw_text), 
+                        model=self.model)
             
             response = client.chat.completions.create(
                 model=self.model,
@@ -64,12 +65,12 @@ class TextNormalizationStage(PipelineStage):
             )
             
             normalized_text = response.choices[0].message.content.strip()
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = (time.perf_counter_ns() - start_time) // 1_000_000
             
-            logger.info("Text normalization completed",
-                       original_length=len(raw_text),
-                       normalized_length=len(normalized_text),
-                       processing_time_ms=processing_time)
+            logger.debug("Text normalization completed",
+                        original_length=len(raw_text),
+                        normalized_length=len(normalized_text),
+                        processing_time_ms=processing_time)
             
             return {
                 "normalized_text": normalized_text,
@@ -117,7 +118,7 @@ class BillingMappingStage(PipelineStage):
     
     async def process(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract billing codes with reasoning from normalized text"""
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         normalized_text = data.get("normalized_text", "")
         findings = data.get("findings", [])
@@ -126,9 +127,9 @@ class BillingMappingStage(PipelineStage):
             import openai
             client = openai.OpenAI(api_key=self.api_key)
             
-            logger.info("Starting billing code mapping", 
-                       text_length=len(normalized_text),
-                       model=self.model)
+            logger.debug("Starting billing code mapping",
+                        text_length=len(normalized_text),
+                        model=self.model)
             
             # Load BEMA/GOZ catalog for context
             bema_goz_catalog = self._load_billing_catalog()
@@ -157,11 +158,11 @@ class BillingMappingStage(PipelineStage):
             # Enhance with actual fee calculations
             enhanced_codes = self._enhance_billing_codes(billing_result.get("billing_codes", []), bema_goz_catalog)
             
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = (time.perf_counter_ns() - start_time) // 1_000_000
             
-            logger.info("Billing mapping completed",
-                       codes_extracted=len(enhanced_codes),
-                       processing_time_ms=processing_time)
+            logger.debug("Billing mapping completed",
+                        codes_extracted=len(enhanced_codes),
+                        processing_time_ms=processing_time)
             
             return {
                 "billing_codes": enhanced_codes,
@@ -251,13 +252,9 @@ Analysiere den Text und extrahiere alle Abrechnungspositionen mit Begründung.
 """
     
     def _load_billing_catalog(self) -> Dict:
-        """Load BEMA/GOZ catalog"""
-        from pathlib import Path
-        
-        data_file = Path(__file__).parent.parent.parent / "data" / "bema_goz_codes.json"
+        """Load BEMA/GOZ catalog (parsed once per process, read-only)"""
         try:
-            with open(data_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_catalog()
         except FileNotFoundError:
             return {"bema_codes": {}, "goz_codes": {}, "meta": {"bema_point_value": 1.0, "goz_point_value": 0.0582}}
     
@@ -335,7 +332,7 @@ class AdvancedBillingStage(PipelineStage):
         
     async def process(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Advanced billing analysis for complex cases using o3's superior reasoning"""
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         normalized_text = data.get("normalized_text", "")
         findings = data.get("findings", [])
@@ -345,10 +342,10 @@ class AdvancedBillingStage(PipelineStage):
             import openai
             client = openai.OpenAI(api_key=self.api_key)
             
-            logger.info("Starting advanced billing analysis", 
-                       text_length=len(normalized_text),
-                       initial_codes=len(initial_codes),
-                       model=self.model)
+            logger.debug("Starting advanced billing analysis",
+                        text_length=len(normalized_text),
+                        initial_codes=len(initial_codes),
+                        model=self.model)
             
             # Load BEMA/GOZ catalog for context
             bema_goz_catalog = self._load_billing_catalog()
@@ -377,12 +374,12 @@ class AdvancedBillingStage(PipelineStage):
             # Enhance with actual fee calculations
             enhanced_codes = self._enhance_billing_codes(billing_result.get("billing_codes", []), bema_goz_catalog)
             
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = (time.perf_counter_ns() - start_time) // 1_000_000
             
-            logger.info("Advanced billing analysis completed",
-                       final_codes=len(enhanced_codes),
-                       improvements_made=len(enhanced_codes) - len(initial_codes),
-                       processing_time_ms=processing_time)
+            logger.debug("Advanced billing analysis completed",
+                        final_codes=len(enhanced_codes),
+                        improvements_made=len(enhanced_codes) - len(initial_codes),
+                        processing_time_ms=processing_time)
             
             return {
                 "billing_codes": enhanced_codes,
@@ -510,13 +507,9 @@ Führe eine umfassende Analyse durch und gib optimierte Abrechnungsempfehlungen.
     
     # Reuse methods from BillingMappingStage
     def _load_billing_catalog(self) -> Dict:
-        """Load BEMA/GOZ catalog"""
-        from pathlib import Path
-        
-        data_file = Path(__file__).parent.parent.parent / "data" / "bema_goz_codes.json"
+        """Load BEMA/GOZ catalog (parsed once per process, read-only)"""
         try:
-            with open(data_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_catalog()
         except FileNotFoundError:
             return {"bema_codes": {}, "goz_codes": {}, "meta": {"bema_point_value": 1.0, "goz_point_value": 0.0582}}
     
@@ -605,7 +598,7 @@ class PlausibilityCheckStage(PipelineStage):
     
     async def process(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Review and validate billing codes for completeness and accuracy"""
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         # Calculate case complexity for intelligent model selection
         total_value = self._calculate_case_value(data.get("billing_codes", []))
@@ -622,12 +615,12 @@ class PlausibilityCheckStage(PipelineStage):
             import openai
             client = openai.OpenAI(api_key=self.api_key)
             
-            logger.info("Starting plausibility check", 
-                       model=selected_model,
-                       codes_to_review=len(data.get("billing_codes", [])),
-                       case_value_euros=total_value,
-                       reasoning_mode=self.reasoning_mode,
-                       using_full_o3=use_full_o3)
+            logger.debug("Starting plausibility check",
+                        model=selected_model,
+                        codes_to_review=len(data.get("billing_codes", [])),
+                        case_value_euros=total_value,
+                        reasoning_mode=self.reasoning_mode,
+                        using_full_o3=use_full_o3)
             
             # Adjust max_tokens for o3 models (they can handle more complex reasoning)
             max_tokens = 2000 if selected_model.startswith("o3") else 1000
@@ -650,13 +643,13 @@ class PlausibilityCheckStage(PipelineStage):
             )
             
             audit_result = json.loads(response.choices[0].message.content)
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = (time.perf_counter_ns() - start_time) // 1_000_000
             
-            logger.info("Plausibility check completed",
-                       issues_found=len(audit_result.get("issues", [])),
-                       overall_confidence=audit_result.get("overall_confidence", 0),
-                       processing_time_ms=processing_time,
-                       model_used=selected_model)
+            logger.debug("Plausibility check completed",
+                        issues_found=len(audit_result.get("issues", [])),
+                        overall_confidence=audit_result.get("overall_confidence", 0),
+                        processing_time_ms=processing_time,
+                        model_used=selected_model)
             
             return {
                 "audit_result": audit_result,
@@ -833,24 +826,24 @@ class ProcessingPipeline:
     ) -> Dict[str, Any]:
         """Run complete pipeline from raw text to validated billing codes"""
         
-        pipeline_start = time.time()
+        pipeline_start = time.perf_counter_ns()
         results = {
             "raw_text": raw_text,
             "pipeline_stages": {},
             "final_output": {}
         }
         
-        logger.info("Starting complete processing pipeline", 
-                   text_length=len(raw_text))
+        logger.debug("Starting complete processing pipeline",
+                    text_length=len(raw_text))
         
         try:
             # Stage B: Text Normalization
-            logger.info("🔧 Stage B: Text Normalization")
+            logger.debug("🔧 Stage B: Text Normalization")
             norm_result = await self.stages["normalization"].process(raw_text)
             results["pipeline_stages"]["normalization"] = norm_result
             
             # Stage C: Billing Mapping
-            logger.info("💰 Stage C: Billing Code Mapping")
+            logger.debug("💰 Stage C: Billing Code Mapping")
             billing_input = {
                 **norm_result,
                 "findings": findings or []
@@ -861,7 +854,7 @@ class ProcessingPipeline:
             # Stage C+: Advanced Billing Optimization (optional, for complex cases)
             final_billing_result = billing_result
             if self.use_advanced_billing and self._should_use_advanced_billing(billing_result):
-                logger.info("🧠 Stage C+: Advanced Billing Optimization (o3)")
+                logger.debug("🧠 Stage C+: Advanced Billing Optimization (o3)")
                 advanced_input = {
                     **norm_result,
                     **billing_result,
@@ -871,13 +864,13 @@ class ProcessingPipeline:
                 results["pipeline_stages"]["advanced_billing"] = advanced_result
                 final_billing_result = advanced_result
                 
-                logger.info("Advanced billing optimization completed",
-                           original_codes=len(billing_result.get("billing_codes", [])),
-                           optimized_codes=len(advanced_result.get("billing_codes", [])),
-                           improvements=len(advanced_result.get("improvements", [])))
+                logger.debug("Advanced billing optimization completed",
+                            original_codes=len(billing_result.get("billing_codes", [])),
+                            optimized_codes=len(advanced_result.get("billing_codes", [])),
+                            improvements=len(advanced_result.get("improvements", [])))
             
             # Stage D: Plausibility Check
-            logger.info("🔍 Stage D: Plausibility Check")
+            logger.debug("🔍 Stage D: Plausibility Check")
             audit_input = {
                 **norm_result,
                 **final_billing_result
@@ -886,7 +879,7 @@ class ProcessingPipeline:
             results["pipeline_stages"]["plausibility_check"] = audit_result
             
             # Compile final output
-            total_time = int((time.time() - pipeline_start) * 1000)
+            total_time = (time.perf_counter_ns() - pipeline_start) // 1_000_000
             
             # Determine pipeline type used
             pipeline_type = "multi_stage_ai"
@@ -916,7 +909,7 @@ class ProcessingPipeline:
             
         except Exception as e:
             logger.error("💥 Pipeline processing failed", error=str(e))
-            total_time = int((time.time() - pipeline_start) * 1000)
+            total_time = (time.perf_counter_ns() - pipeline_start) // 1_000_000
             
             results["final_output"] = {
                 "normalized_text": raw_text,
@@ -954,12 +947,12 @@ class ProcessingPipeline:
         
         should_use = value_threshold_met or low_confidence or complex_procedures
         
-        logger.info("Advanced billing decision", 
-                   case_value=total_value,
-                   threshold=self.advanced_billing_threshold,
-                   confidence=billing_result.get("confidence", 1.0),
-                   complex_procedures=complex_procedures,
-                   decision=should_use)
+        logger.debug("Advanced billing decision",
+                    case_value=total_value,
+                    threshold=self.advanced_billing_threshold,
+                    confidence=billing_result.get("confidence", 1.0),
+                    complex_procedures=complex_procedures,
+                    decision=should_use)
         
         return should_use
     
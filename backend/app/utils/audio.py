@@ -4,9 +4,14 @@ Handles audio format validation, conversion, and metadata extraction
 """
 
 import io
+import mmap
+import os
 import struct
+import subprocess
+import tempfile
 import wave
-from typing import BinaryIO, Dict, Any
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Any, Iterator, Optional, Tuple, Union
 from pathlib import Path
 import structlog
 
@@ -15,6 +20,12 @@ from app.core.config import settings
 
 logger = structlog.get_logger()
 
+# RAM-backed scratch space for the ffmpeg tempfile fallback, if the host has one
+TMPFS_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Enough of the file to parse WAV/MP3/M4A headers without reading the audio
+HEADER_PROBE_BYTES = 4096
+
 
 class AudioValidationError(Exception):
     """Custom exception for audio validation errors"""
@@ -29,13 +40,20 @@ class AudioProcessor:
         self.max_file_size = settings.MAX_AUDIO_SIZE_MB * 1024 * 1024
         self.target_sample_rate = settings.AUDIO_SAMPLE_RATE
     
-    def validate_audio(self, audio_data: bytes, filename: str) -> AudioMetadata:
+    def validate_audio(
+        self,
+        audio_data: Union[bytes, mmap.mmap],
+        filename: str,
+        size_bytes: Optional[int] = None
+    ) -> AudioMetadata:
         """
         Validate audio file and extract metadata
         
         Args:
-            audio_data: Raw audio file bytes
+            audio_data: Raw audio file bytes (or a read-only mmap of them); the
+                leading header bytes are enough when size_bytes is given
             filename: Original filename
+            size_bytes: Full file size, if audio_data is only the header
             
         Returns:
             AudioMetadata with file information
@@ -43,15 +61,18 @@ class AudioProcessor:
         Raises:
             AudioValidationError: If validation fails
         """
-        logger.info("Validating audio file", filename=filename, size_bytes=len(audio_data))
+        if size_bytes is None:
+            size_bytes = len(audio_data)
+        
+        logger.info("Validating audio file", filename=filename, size_bytes=size_bytes)
         
         # Check file size
-        if len(audio_data) > self.max_file_size:
+        if size_bytes > self.max_file_size:
             raise AudioValidationError(
-                f"File too large: {len(audio_data)} bytes (max: {self.max_file_size})"
+                f"File too large: {size_bytes} bytes (max: {self.max_file_size})"
             )
         
-        if len(audio_data) < 1000:  # Minimum reasonable file size
+        if size_bytes < 1000:  # Minimum reasonable file size
             raise AudioValidationError("File too small to contain valid audio")
         
         # Check file extension
@@ -64,16 +85,16 @@ class AudioProcessor:
         # Extract metadata based on format
         try:
             if file_ext == 'wav':
-                metadata = self._analyze_wav(audio_data)
+                metadata = self._analyze_wav(audio_data, size_bytes)
             elif file_ext in ['mp3', 'm4a']:
-                metadata = self._analyze_compressed_audio(audio_data, file_ext)
+                metadata = self._analyze_compressed_audio(audio_data, file_ext, size_bytes)
             else:
                 # Generic metadata for other formats
                 metadata = AudioMetadata(
                     duration_seconds=0.0,  # Unknown
                     sample_rate=self.target_sample_rate,
                     format=file_ext,
-                    size_bytes=len(audio_data),
+                    size_bytes=size_bytes,
                     quality_score=None
                 )
             
@@ -89,12 +110,13 @@ class AudioProcessor:
             logger.error("Audio analysis failed", filename=filename, error=str(e))
             raise AudioValidationError(f"Failed to analyze audio: {str(e)}")
     
-    def _analyze_wav(self, audio_data: bytes) -> AudioMetadata:
+    def _analyze_wav(self, audio_data: Union[bytes, mmap.mmap], size_bytes: int) -> AudioMetadata:
         """Analyze WAV file format"""
         
         try:
-            # Create BytesIO from audio data
-            audio_io = io.BytesIO(audio_data)
+            # Wrapping bytes in BytesIO does not copy; an mmap is already file-like
+            audio_io = audio_data if isinstance(audio_data, mmap.mmap) else io.BytesIO(audio_data)
+            audio_io.seek(0)
             
             # Open with wave module
             with wave.open(audio_io, 'rb') as wav_file:
@@ -113,7 +135,7 @@ class AudioProcessor:
                     duration_seconds=duration_seconds,
                     sample_rate=sample_rate,
                     format="wav",
-                    size_bytes=len(audio_data),
+                    size_bytes=size_bytes,
                     quality_score=quality_score
                 )
                 
@@ -122,7 +144,12 @@ class AudioProcessor:
         except Exception as e:
             raise AudioValidationError(f"WAV analysis error: {str(e)}")
     
-    def _analyze_compressed_audio(self, audio_data: bytes, format_name: str) -> AudioMetadata:
+    def _analyze_compressed_audio(
+        self,
+        audio_data: Union[bytes, mmap.mmap],
+        format_name: str,
+        size_bytes: int
+    ) -> AudioMetadata:
         """Analyze compressed audio formats (MP3, M4A, etc.)"""
         
         try:
@@ -147,7 +174,7 @@ class AudioProcessor:
                 logger.warning("No valid signature found, but proceeding", format=format_name)
             
             # Estimate duration (rough approximation for MP3)
-            estimated_duration = self._estimate_compressed_duration(audio_data, format_name)
+            estimated_duration = self._estimate_compressed_duration(size_bytes, format_name)
             
             # Default quality score for compressed audio
             quality_score = 0.8  # Assume good quality
@@ -156,14 +183,14 @@ class AudioProcessor:
                 duration_seconds=estimated_duration,
                 sample_rate=self.target_sample_rate,  # Assume target sample rate
                 format=format_name,
-                size_bytes=len(audio_data),
+                size_bytes=size_bytes,
                 quality_score=quality_score
             )
             
         except Exception as e:
             raise AudioValidationError(f"{format_name.upper()} analysis error: {str(e)}")
     
-    def _estimate_compressed_duration(self, audio_data: bytes, format_name: str) -> float:
+    def _estimate_compressed_duration(self, size_bytes: int, format_name: str) -> float:
         """Estimate duration for compressed audio formats"""
         
         # Rough estimation based on typical bitrates
@@ -175,7 +202,7 @@ class AudioProcessor:
         bitrate = typical_bitrates.get(format_name, 128000)
         
         # Duration = (file_size_bits * 8) / bitrate
-        estimated_duration = (len(audio_data) * 8) / bitrate
+        estimated_duration = (size_bytes * 8) / bitrate
         
         # Add some bounds checking
         estimated_duration = max(0.1, min(estimated_duration, 3600))  # 0.1s to 1 hour
@@ -277,6 +304,180 @@ class AudioProcessor:
         }
 
 
+def read_header(audio_file: BinaryIO, limit: int = HEADER_PROBE_BYTES) -> Tuple[bytes, int]:
+    """
+    Read the leading bytes of an upload and its total size
+    
+    Lets callers that stream the file onward validate it without loading the
+    whole recording. The file position is reset afterwards.
+    
+    Returns:
+        Tuple of (header bytes, file size in bytes)
+    """
+    audio_file.seek(0, io.SEEK_END)
+    size = audio_file.tell()
+    audio_file.seek(0)
+    head = audio_file.read(limit)
+    audio_file.seek(0)
+    return head, size
+
+
+@contextmanager
+def map_upload(audio_file: BinaryIO) -> Iterator[Union[bytes, mmap.mmap]]:
+    """
+    Expose an uploaded file's contents without copying them onto the heap
+    
+    Spools that already rolled over to disk (larger than
+    UPLOAD_SPOOL_MAX_SIZE) are memory-mapped read-only; smaller in-memory
+    uploads are read as bytes. The file position is reset afterwards.
+    """
+    audio_file.seek(0, io.SEEK_END)
+    size = audio_file.tell()
+    audio_file.seek(0)
+    
+    fileno = None
+    if size > settings.UPLOAD_SPOOL_MAX_SIZE:
+        try:
+            fileno = audio_file.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            pass
+    
+    if fileno is None:
+        # A whole-buffer read() from offset 0 of an in-memory spool (BytesIO)
+        # returns its internal bytes object, so this does not copy either
+        audio_data = audio_file.read()
+        audio_file.seek(0)
+        yield audio_data
+        return
+    
+    audio_file.flush()
+    mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    try:
+        yield mapped
+    finally:
+        mapped.close()
+
+
+def decode_pcm16(source: Union[str, bytes, mmap.mmap], sample_rate: int = 16000):
+    """
+    Decode an audio file path or in-memory upload to mono 16-bit PCM at the given sample rate
+    
+    Samples stay int16 so callers can scale to float on the device they
+    compute on. WAV data that already matches is read directly; anything
+    else is decoded and resampled in one pass, in-process with PyAV when it
+    is installed (it ships with faster-whisper), otherwise by an ffmpeg
+    subprocess fed through stdin when the audio is already in memory.
+    
+    Returns:
+        numpy int16 array of samples
+    """
+    import numpy as np
+    
+    if isinstance(source, mmap.mmap):
+        source.seek(0)
+    try:
+        with wave.open(io.BytesIO(source) if isinstance(source, bytes) else source, 'rb') as wav_file:
+            if (wav_file.getnchannels() == 1 and wav_file.getsampwidth() == 2
+                    and wav_file.getframerate() == sample_rate):
+                return np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+    except (wave.Error, EOFError):
+        pass  # Not a plain PCM WAV file
+    
+    try:
+        import av
+    except ImportError:
+        av = None
+    if av is not None:
+        return _av_pcm16(av, source, sample_rate)
+    
+    if isinstance(source, str):
+        return np.frombuffer(_ffmpeg_pcm16(source, sample_rate), dtype=np.int16)
+    
+    try:
+        return np.frombuffer(_ffmpeg_pcm16("pipe:0", sample_rate, source), dtype=np.int16)
+    except AudioValidationError:
+        # Containers that need seeking (e.g. MP4/M4A with a trailing moov atom)
+        # cannot be demuxed from a pipe; retry those from a temporary file
+        pass
+    
+    fd = _anonymous_tmpfile()
+    if fd is None:
+        with tempfile.NamedTemporaryFile(dir=TMPFS_DIR) as temp_file:
+            temp_file.write(source)
+            temp_file.flush()
+            return np.frombuffer(_ffmpeg_pcm16(temp_file.name, sample_rate), dtype=np.int16)
+    
+    try:
+        view = memoryview(source)
+        while view:
+            view = view[os.write(fd, view):]
+        return np.frombuffer(
+            _ffmpeg_pcm16(f"/proc/self/fd/{fd}", sample_rate, pass_fds=(fd,)), dtype=np.int16
+        )
+    finally:
+        os.close(fd)
+
+
+def _anonymous_tmpfile() -> Optional[int]:
+    """
+    Open an unnamed file in RAM-backed storage (Linux O_TMPFILE)
+    
+    The inode has no directory entry, so there is nothing to unlink and the
+    kernel frees it when the descriptor is closed. Returns None where
+    O_TMPFILE is unavailable.
+    """
+    if not hasattr(os, "O_TMPFILE"):
+        return None
+    try:
+        return os.open(TMPFS_DIR or tempfile.gettempdir(), os.O_TMPFILE | os.O_RDWR, 0o600)
+    except OSError:
+        return None
+
+
+def _av_pcm16(av, source: Union[str, bytes, mmap.mmap], sample_rate: int):
+    """Demux, decode and resample to mono s16 in-process with PyAV"""
+    import numpy as np
+    
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    elif isinstance(source, mmap.mmap):
+        source.seek(0)
+    
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+    chunks = []
+    try:
+        with av.open(source, mode="r") as container:
+            stream = container.streams.audio[0]
+            for frame in container.decode(stream):
+                frame.pts = None  # Resampler only needs the samples
+                chunks.extend(out.to_ndarray() for out in resampler.resample(frame))
+            chunks.extend(out.to_ndarray() for out in resampler.resample(None))
+    except (av.error.FFmpegError, IndexError) as e:
+        raise AudioValidationError(f"Failed to decode audio: {str(e)}")
+    
+    # s16 frames are packed (1, samples) arrays
+    return np.concatenate(chunks, axis=None) if chunks else np.zeros(0, dtype=np.int16)
+
+
+def _ffmpeg_pcm16(
+    input_url: str,
+    sample_rate: int,
+    data: Union[bytes, mmap.mmap, None] = None,
+    pass_fds: Tuple[int, ...] = ()
+) -> bytes:
+    """Run one ffmpeg decode + resample pass to raw mono s16le"""
+    cmd = [
+        "ffmpeg", "-threads", "0", "-i", input_url,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sample_rate), "-"
+    ]
+    if data is None:
+        cmd.insert(1, "-nostdin")
+    try:
+        return subprocess.run(cmd, input=data, capture_output=True, check=True, pass_fds=pass_fds).stdout
+    except subprocess.CalledProcessError as e:
+        raise AudioValidationError(f"Failed to decode audio: {e.stderr.decode(errors='replace')}")
+
+
 def create_test_audio_file() -> bytes:
     """Create a test WAV file for testing purposes"""
     
@@ -0,0 +1,9 @@
+"""
+Pytest configuration for the MedVox backend
+Runs before any test module imports the app, so settings see these values
+"""
+
+import os
+
+# Fail the request (and the test) on N+1 query patterns instead of only logging
+os.environ.setdefault("QUERY_REPEAT_RAISE", "true")
@@ -0,0 +1,58 @@
+"""
+Tests for dental finding extraction from normalized transcriptions
+"""
+
+import asyncio
+
+from app.schemas.dental_documentation import AudioMetadata, TranscriptionResult
+from app.services.documentation_processor import DocumentationProcessor
+
+
+processor = DocumentationProcessor()
+
+
+def extract(text: str):
+    return processor._extract_dental_findings(processor._normalize_text(text))
+
+
+def test_zahn_finding_is_extracted_once():
+    findings = extract("Zahn drei sechs okklusal Karies profunda, Lokalanästhesie, Kompositfüllung gelegt")
+
+    assert [(f.tooth_number, f.surface, f.diagnosis, f.severity) for f in findings] == [
+        ("36", "okklusal", "Karies profunda", "normal"),
+    ]
+
+
+def test_bare_number_finding_without_surface():
+    findings = extract("Zahn zwei vier Pulpitis, Infiltrationsanästhesie")
+
+    assert [(f.tooth_number, f.surface, f.diagnosis) for f in findings] == [("24", None, "Pulpitis")]
+
+
+def test_text_without_findings():
+    assert extract("Professionelle Zahnreinigung, Fluoridierung") == []
+
+
+def test_dash_separated_tooth_number_is_processed():
+    # En dashes are folded by the normalization table; the folded text must
+    # still flow through findings extraction end to end
+    transcription = TranscriptionResult(
+        text="Zahn vier–sechs mesial Karies media, Füllung zweiflächig, Lokalanästhesie",
+        language="de",
+        confidence=0.9,
+        processing_time_ms=1000,
+        stt_model="whisper-base",
+    )
+    audio_metadata = AudioMetadata(
+        duration_seconds=5.0,
+        sample_rate=16000,
+        format="wav",
+        size_bytes=160000,
+        quality_score=0.9,
+    )
+
+    documentation = asyncio.run(processor.process_transcription(transcription, audio_metadata))
+
+    assert [(f.tooth_number, f.surface, f.diagnosis) for f in documentation.findings] == [
+        ("46", "mesial", "Karies media"),
+    ]
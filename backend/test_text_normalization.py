@@ -0,0 +1,45 @@
+"""
+Tests for spoken tooth-number normalization
+The trie-factored term regex must behave like a whole-word, longest-first
+alternation of the same terms
+"""
+
+import random
+import re
+
+import pytest
+
+from app.services.documentation_processor import DocumentationProcessor, GermanDentalTerminology
+
+
+TOOTH_NUMBERS = GermanDentalTerminology.TOOTH_NUMBERS
+ALTERNATION = re.compile(
+    r"(?<!\w)(?:" + "|".join(re.escape(term) for term in sorted(TOOTH_NUMBERS, key=len, reverse=True)) + r")(?!\w)"
+)
+
+processor = DocumentationProcessor()
+
+
+def substitute(pattern: re.Pattern, text: str) -> str:
+    return pattern.sub(lambda match: TOOTH_NUMBERS[match.group(0)], text)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Zahn drei dreizehn", "zahn drei 13"),
+    ("Zahn drei sechs okklusal Karies", "zahn 36 okklusal karies"),
+    ("zwei-eins achtundvierzig", "21 48"),
+    ("dreizehnte Sitzung", "dreizehnte sitzung"),
+])
+def test_normalize_text_tooth_numbers(text, expected):
+    assert processor._normalize_text(text) == expected
+
+
+def test_trie_pattern_matches_flat_alternation():
+    words = ["eins", "zwei", "drei", "vier", "sechs", "acht", "zehn", "zahn", "und", "dreizehn",
+             "achtundvierzig", "sechsunddreißig", "zwanzig", "-", " ", "s"]
+    words += list(TOOTH_NUMBERS)
+    rng = random.Random(17)
+
+    for _ in range(4000):
+        text = " ".join("".join(rng.choices(words, k=rng.randint(1, 3))) for _ in range(rng.randint(1, 6)))
+        assert substitute(GermanDentalTerminology.TOOTH_NUMBER_PATTERN, text) == substitute(ALTERNATION, text), text
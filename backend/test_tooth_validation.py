@@ -0,0 +1,26 @@
+"""
+Tests for FDI tooth-number validation on treatments
+"""
+
+import pytest
+
+import app.models  # noqa: F401  (configures every mapper the relationships refer to)
+from app.models.treatment import Treatment
+
+
+@pytest.mark.parametrize("numbers, expected", [
+    (["36", "11"], [36, 11]),
+    ([18, 28, 38, 48], [18, 28, 38, 48]),
+    ([51, 65, 75, 85], [51, 65, 75, 85]),
+    ([], []),
+    (None, None),
+])
+def test_valid_tooth_numbers_are_stored_as_integers(numbers, expected):
+    treatment = Treatment(tooth_numbers=numbers)
+    assert treatment.tooth_numbers == expected
+
+
+@pytest.mark.parametrize("numbers", [[0], [99], [-5], [19], [56], [36, 49], ["abc"]])
+def test_invalid_tooth_numbers_are_rejected(numbers):
+    with pytest.raises(ValueError):
+        Treatment(tooth_numbers=numbers)
@@ -0,0 +1,94 @@
+"""
+Tests for Whisper transcript post-processing
+Real dictation must pass through unchanged; decoding loops and subtitle
+boilerplate must be removed
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.audio_service import FasterWhisperService, clean_transcript, collapse_repeated_ngrams
+
+
+@pytest.mark.parametrize("text", [
+    "Taschentiefen Zahn 16: drei drei drei drei zwei drei.",
+    "Sondierungstiefen 3 3 3 3 2 2, Zahn 17 4 4 4 4 4 4",
+    "Sondierungstiefen " + " ".join(["3"] * 24),
+    "nein nein nein nein",
+    "Zahn 36 Zahn 37 Zahn 38",
+    "Karies Karies Karies",
+])
+def test_real_dictation_passes_through(text):
+    assert collapse_repeated_ngrams(text) == text
+    assert clean_transcript(text) == text
+
+
+def test_four_word_loop_is_collapsed():
+    looped = "Zahn 36 okklusal Karies " * 6 + "Füllung gelegt."
+    assert collapse_repeated_ngrams(looped) == "Zahn 36 okklusal Karies Füllung gelegt."
+
+
+def test_short_phrase_loop_is_collapsed_to_one_window():
+    looped = "Befund: " + "Zahn 36 " * 10 + "Ende"
+    assert collapse_repeated_ngrams(looped) == "Befund: Zahn 36 Zahn 36 Ende"
+
+
+def test_loop_at_repeat_limit_is_kept():
+    text = " ".join(["Zahn 36 okklusal Karies"] * 3)
+    assert collapse_repeated_ngrams(text) == text
+
+
+def test_subtitle_boilerplate_is_removed():
+    text = "Zahn 36 Füllung gelegt. Untertitel im Auftrag des ZDF, 2021"
+    assert clean_transcript(text) == "Zahn 36 Füllung gelegt."
+
+
+class StubPipeline:
+    """Stands in for BatchedInferencePipeline with pre-decoded segments"""
+
+    def __init__(self, texts):
+        self.texts = texts
+
+    def transcribe(self, audio, **kwargs):
+        segments = (
+            SimpleNamespace(start=float(i), end=float(i + 1), text=text, avg_logprob=-0.2)
+            for i, text in enumerate(self.texts)
+        )
+        return segments, SimpleNamespace(language="de")
+
+
+def stub_service(texts) -> FasterWhisperService:
+    service = FasterWhisperService()
+    service._model = object()  # Marks the model as loaded
+    service._pipeline = StubPipeline(texts)
+    return service
+
+
+async def collect(stream):
+    return [segment async for segment in stream]
+
+
+def test_stream_cleans_each_segment():
+    service = stub_service([
+        " Zahn 36 okklusal Karies." + " Zahn 36 okklusal Karies." * 5,
+        " Untertitel im Auftrag des ZDF, 2021",
+        " Sondierungstiefen 3 3 3 3 2 2",
+    ])
+
+    segments = asyncio.run(collect(service.transcribe_stream("recording.wav")))
+
+    assert [segment["text"] for segment in segments] == [
+        "Zahn 36 okklusal Karies.",
+        " Sondierungstiefen 3 3 3 3 2 2",
+    ]
+
+
+def test_transcribe_joins_streamed_segments():
+    service = stub_service([" Zahn 36 okklusal Karies,", " Kompositfüllung gelegt."])
+
+    result = asyncio.run(service.transcribe("recording.wav"))
+
+    assert result.text == "Zahn 36 okklusal Karies, Kompositfüllung gelegt."
+    assert len(result.segments) == 2